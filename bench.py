@@ -0,0 +1,330 @@
+# bench.py
+"""
+Benchmark suite: converters, subnet math, Tk drawing helpers and PDF export at sizes from small to huge.
+Run with `python main.py bench`; results go to JSON and can be compared against a stored baseline.
+"""
+
+import os
+import sys
+import json
+import time
+import timeit
+import random
+import shutil
+import platform
+import tempfile
+import statistics
+import subprocess
+
+import core
+
+SIZES = ("small", "medium", "large", "huge")
+BENCH_REPEAT = 5
+BENCH_MIN_TIME = 0.1         # seconds per timed batch; the loop count is scaled up to reach it
+BENCH_THRESHOLD = 0.25       # a median more than 25% off the baseline counts as a change
+# the repo ships a reference baseline (small/medium sizes, no draw cases). It only gates (exit status 1) on a
+# machine matching its recorded environment; elsewhere the comparison is just reported, and --save-baseline
+# records this machine's numbers to gate against
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+# ---------- Inputs ----------
+# Seeded per size so every run (and every machine) times the same numbers.
+DECIMAL_DIGITS = {"small": 2, "medium": 40, "large": 1000, "huge": 20000}
+RADIX_DIGITS = {"small": 8, "medium": 128, "large": 4096, "huge": 65536}
+IPV4_INPUTS = {"small": "192.168.1.1/30", "medium": "172.54.1.0/26", "large": "10.20.0.0/16", "huge": "10.0.0.0/8"}
+IPV6_INPUTS = {"small": "2001:db8::1/126", "medium": "2001:db8:abcd::/64", "large": "2001:db8::/32", "huge": "::/0"}
+HOST_COUNTS = {"small": 2, "medium": 500, "large": 70000, "huge": 16000000}
+IPV6_HOST_COUNTS = {"small": 2, "medium": 10**6, "large": 2**64, "huge": 2**120}
+VLSM_INPUTS = {"small": ("192.168.1.0/24", [50, 20, 10]),
+               "medium": ("10.0.0.0/16", [5000, 2000, 900, 300, 100, 50]),
+               "large": ("10.0.0.0/8", [200] * 300),
+               "huge": ("10.0.0.0/8", [50] * 5000)}
+SPLIT_INPUTS = {"small": ("192.168.1.0/24", 28), "medium": ("10.0.0.0/16", 24),
+                "large": ("10.0.0.0/8", 24), "huge": ("10.0.0.0/8", 30)}
+
+def _digits(alphabet, count, size):
+    rng = random.Random(f"{alphabet}-{size}")
+    return rng.choice(alphabet[1:]) + "".join(rng.choice(alphabet) for _ in range(count - 1))
+
+# ---------- Cases ----------
+# Each case is (id, size, setup); setup() returns the zero-argument callable that gets timed.
+# The memoized *_steps functions are benchmarked through __wrapped__ so RESULT_CACHE never answers.
+def converter_cases():
+    converters = [
+        ("decimal_to_binary_steps", "0123456789", DECIMAL_DIGITS),
+        ("decimal_to_octal_steps", "0123456789", DECIMAL_DIGITS),
+        ("decimal_to_hex_steps", "0123456789", DECIMAL_DIGITS),
+        ("binary_to_decimal_steps", "01", RADIX_DIGITS),
+        ("octal_to_decimal_steps", "01234567", RADIX_DIGITS),
+        ("hex_to_decimal_steps", "0123456789ABCDEF", RADIX_DIGITS),
+    ]
+    for name, alphabet, counts in converters:
+        fn = getattr(core, name).__wrapped__
+        for size in SIZES:
+            value = _digits(alphabet, counts[size], size)
+            yield f"convert/{name}", size, lambda fn=fn, value=value: lambda: fn(value)
+
+def subnet_cases():
+    for size in SIZES:
+        fn = core.ipv4_steps_verbose.__wrapped__
+        yield "subnet/ipv4_steps_verbose", size, lambda fn=fn, s=IPV4_INPUTS[size]: lambda: fn(s)
+    for size in SIZES:
+        fn = core.ipv6_steps_verbose.__wrapped__
+        yield "subnet/ipv6_steps_verbose", size, lambda fn=fn, s=IPV6_INPUTS[size]: lambda: fn(s)
+    for size in SIZES:
+        fn = core.hosts_to_ipv4_steps.__wrapped__
+        yield "subnet/hosts_to_ipv4_steps", size, lambda fn=fn, h=HOST_COUNTS[size]: lambda: fn(h)
+    for size in SIZES:
+        fn = core.hosts_to_ipv6_steps.__wrapped__
+        yield "subnet/hosts_to_ipv6_steps", size, lambda fn=fn, h=IPV6_HOST_COUNTS[size]: lambda: fn(h)
+    for size in SIZES:
+        base, hosts = VLSM_INPUTS[size]
+        yield "subnet/vlsm_steps", size, lambda base=base, hosts=hosts: lambda: core.vlsm_steps(base, hosts)
+
+def draw_cases(canvas):
+    import gui
+    def fresh(fn):
+        # every run starts from an empty canvas and includes Tk's own redraw
+        def run():
+            canvas.delete("all")
+            fn()
+            canvas.update_idletasks()
+        return run
+    for size in SIZES:
+        octets = {"small": 1, "medium": 4, "large": 16, "huge": 64}[size]
+        bits = [format(random.Random(i).getrandbits(8), "08b") for i in range(octets)]
+        yield "draw/draw_octet_bits", size, lambda bits=bits: fresh(
+            lambda: [gui.draw_octet_bits(canvas, 20 + (i % 4) * 240, 20 + (i // 4) * 30, b, outline_net=True, tag=f"o{i}")
+                     for i, b in enumerate(bits)])
+    for size in SIZES:
+        viz = core.ipv6_steps_verbose(IPV6_INPUTS[size])[1]
+        rows = {"small": 1, "medium": 4, "large": 16, "huge": 64}[size]
+        yield "draw/draw_hextet_groups", size, lambda viz=viz, rows=rows: fresh(
+            lambda: [gui.draw_hextet_groups(canvas, 20, 20 + r * 30, viz["hextets"]) for r in range(rows)])
+    for size in SIZES:
+        base, prefix = SPLIT_INPUTS[size]
+        seq = core.SubnetSequence(base, prefix)
+        yield "draw/draw_subnet_page", size, lambda seq=seq: fresh(lambda: gui.draw_subnet_page(canvas, 20, 20, seq, page=seq.count // 32))
+    for size in SIZES:
+        viz = core.ipv4_steps_verbose(IPV4_INPUTS[size])[1]
+        yield "draw/host_map", size, lambda viz=viz: fresh(
+            lambda: gui.HostMap(canvas, 20, 20, viz["network_int"], viz["total"],
+                                core.ipv4_host_spans(viz["network_int"], viz["broadcast_int"], viz["prefix"])))
+    for size in SIZES:
+        viz = core.ipv4_steps_verbose(IPV4_INPUTS[size])[1]
+        def scene(viz=viz):
+            # the retained scene is built once and then only reconfigured, as in the tutor
+            s = gui.IPv4Scene.for_canvas(canvas)
+            def run():
+                s.hide()
+                s.show_all(viz)
+                canvas.update_idletasks()
+            return run
+        yield "draw/ipv4_scene_show_all", size, scene
+
+def export_cases(out_dir):
+    import export
+    inputs = {
+        "small": ("ipv4", core.ipv4_steps_verbose(IPV4_INPUTS["small"])),
+        "medium": ("vlsm", core.vlsm_steps(*VLSM_INPUTS["medium"])),
+        "large": ("vlsm", core.vlsm_steps(*VLSM_INPUTS["large"])),
+        # thousands of explanation lines: the paragraph/page layout dominates, not the picture
+        "huge": ("vlsm", core.vlsm_steps(*VLSM_INPUTS["huge"])),
+    }
+    for size in SIZES:
+        kind, (text, data) = inputs[size]
+        filename = os.path.join(out_dir, f"bench-{size}.pdf")
+        def run(kind=kind, text=text, data=data, filename=filename):
+            drawing = export.tutor_drawing(kind, data, title="Benchmark")
+            export.export_to_pdf(filename, "Subnetting Steps", text, drawing=drawing)
+        yield "export/export_to_pdf", size, lambda run=run: run
+
+# ---------- Runner ----------
+def time_case(fn, repeat=BENCH_REPEAT, min_time=BENCH_MIN_TIME):
+    # per-call seconds over `repeat` batches; the loop count is chosen once so a batch takes >= min_time
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.2))
+    runs = [elapsed / number] + [t / number for t in timer.repeat(repeat - 1, number)] if repeat > 1 else [elapsed / number]
+    return {"best_s": min(runs), "median_s": statistics.median(runs), "number": number, "repeat": len(runs)}
+
+def start_display():
+    # Tk needs an X server; start a private Xvfb when there is none -> (process or None, skip reason or None)
+    if os.environ.get("DISPLAY"):
+        return None, None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        return None, "no $DISPLAY and Xvfb is not installed"
+    display = next((f":{n}" for n in range(99, 200) if not os.path.exists(f"/tmp/.X11-unix/X{n}")), None)
+    if display is None:
+        return None, "no free X display number for Xvfb"
+    proc = subprocess.Popen([xvfb, display, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 5
+    while not os.path.exists(f"/tmp/.X11-unix/X{display[1:]}"):
+        if proc.poll() is not None or time.monotonic() > deadline:
+            proc.kill()
+            return None, "Xvfb did not start"
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = display
+    return proc, None
+
+def _selected(case_id, size, sizes, patterns):
+    return size in sizes and (not patterns or any(p in case_id for p in patterns))
+
+def run_benchmarks(groups=("convert", "subnet", "draw", "export"), sizes=SIZES, patterns=(),
+                   repeat=BENCH_REPEAT, min_time=BENCH_MIN_TIME, progress=None):
+    results, skipped = {}, {}
+
+    def run_all(cases):
+        for case_id, size, setup in cases:
+            if not _selected(case_id, size, sizes, patterns):
+                continue
+            key = f"{case_id}/{size}"
+            try:
+                results[key] = time_case(setup(), repeat, min_time)
+            except Exception as e:
+                skipped[key] = f"{type(e).__name__}: {e}"
+            if progress:
+                progress(key, results.get(key), skipped.get(key))
+
+    if "convert" in groups:
+        run_all(converter_cases())
+    if "subnet" in groups:
+        run_all(subnet_cases())
+    if "draw" in groups:
+        xvfb, reason = start_display()
+        root = None
+        try:
+            if reason is None:
+                try:
+                    import tkinter as tk
+                    root = tk.Tk()
+                    root.withdraw()
+                except Exception as e:
+                    reason = f"Tk unavailable: {e}"
+            if reason is not None:
+                skipped["draw"] = reason
+            else:
+                canvas = tk.Canvas(root, width=1200, height=900)
+                canvas.pack()
+                run_all(draw_cases(canvas))
+        finally:
+            if root is not None:
+                root.destroy()
+            if xvfb is not None:
+                xvfb.terminate()
+                xvfb.wait()
+    if "export" in groups:
+        import export
+        if not export.REPORTLAB_AVAILABLE:
+            skipped["export"] = "reportlab is not installed"
+        else:
+            with tempfile.TemporaryDirectory() as out_dir:
+                run_all(export_cases(out_dir))
+    return results, skipped
+
+def environment():
+    np = None
+    if core.NUMPY_AVAILABLE:
+        np = core._numpy().__version__
+    return {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "platform": platform.platform(), "machine": platform.machine(), "cpus": os.cpu_count(),
+            "numpy": np, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+# ---------- Baseline comparison ----------
+def compare(results, baseline, threshold=BENCH_THRESHOLD):
+    # -> [(case, current median, baseline median or None, ratio or None, "slower"/"faster"/"same"/"new")]
+    rows = []
+    for key, r in results.items():
+        old = baseline.get(key)
+        if old is None:
+            rows.append((key, r["median_s"], None, None, "new"))
+            continue
+        ratio = r["median_s"] / old["median_s"] if old["median_s"] else float("inf")
+        status = "slower" if ratio > 1 + threshold else "faster" if ratio < 1 / (1 + threshold) else "same"
+        rows.append((key, r["median_s"], old["median_s"], ratio, status))
+    return rows
+
+def _fmt_time(s):
+    if s is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if s >= scale:
+            return f"{s / scale:.3g} {unit}"
+    return f"{s / 1e-9:.3g} ns"
+
+def bench_main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(prog="main.py bench", description="Time converters, subnet math, Tk drawing and PDF export.")
+    parser.add_argument("groups", nargs="*", default=["convert", "subnet", "draw", "export"],
+                        help="any of: convert subnet draw export (default: all)")
+    parser.add_argument("-k", dest="patterns", action="append", default=[], help="only cases whose id contains this text (repeatable)")
+    parser.add_argument("--sizes", default=",".join(SIZES), help="comma-separated subset of " + ",".join(SIZES))
+    parser.add_argument("-n", "--repeat", type=int, default=BENCH_REPEAT, help="timed batches per case")
+    parser.add_argument("--min-time", type=float, default=BENCH_MIN_TIME, help="seconds per batch")
+    parser.add_argument("-o", "--output", help="write results JSON here")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline JSON to compare against (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=BENCH_THRESHOLD, help="relative change reported as slower/faster")
+    parser.add_argument("--list", action="store_true", help="list case ids and exit")
+    args = parser.parse_args(argv)
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    for s in sizes:
+        if s not in SIZES:
+            parser.error(f"unknown size {s!r}; choose from {', '.join(SIZES)}")
+    for g in args.groups:
+        if g not in ("convert", "subnet", "draw", "export"):
+            parser.error(f"unknown group {g!r}")
+
+    if args.list:
+        cases = list(converter_cases()) + list(subnet_cases())
+        for case_id, size, _ in cases:
+            if _selected(case_id, size, sizes, args.patterns):
+                print(f"{case_id}/{size}")
+        print("draw/* and export/* cases are listed when they run (they need Tk and reportlab)")
+        return 0
+
+    def progress(key, r, error):
+        if r is not None:
+            print(f"{key:<48} {_fmt_time(r['median_s']):>10}  (best {_fmt_time(r['best_s'])}, {r['number']}x{r['repeat']})", file=sys.stderr)
+        else:
+            print(f"{key:<48} skipped: {error}", file=sys.stderr)
+
+    results, skipped = run_benchmarks(args.groups, sizes, args.patterns, max(1, args.repeat), args.min_time, progress)
+    for key, reason in skipped.items():
+        if "/" not in key:
+            print(f"{key:<48} skipped: {reason}", file=sys.stderr)
+    report = {"environment": environment(), "results": results, "skipped": skipped}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline saved to {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}: nothing to compare, so regressions are NOT checked. "
+              f"Run with --save-baseline to record one on this machine.", file=sys.stderr)
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline.get("results", {}), args.threshold)
+    print(f"{'case':<48} {'now':>10} {'baseline':>10} {'ratio':>7}")
+    for key, now, old, ratio, status in rows:
+        mark = {"slower": "  << slower", "faster": "  >> faster"}.get(status, "")
+        print(f"{key:<48} {_fmt_time(now):>10} {_fmt_time(old):>10} {'' if ratio is None else f'{ratio:6.2f}x':>7}{mark}")
+    env = baseline.get("environment", {})
+    if (env.get("machine"), env.get("python"), env.get("cpus")) != (platform.machine(), platform.python_version(), os.cpu_count()):
+        # timings from another environment are not comparable enough to fail a run on
+        print(f"note: baseline was recorded on {env.get('machine')} / Python {env.get('python')} / {env.get('cpus')} CPUs; "
+              f"results are reported only, not checked (--save-baseline records one for this machine)", file=sys.stderr)
+        return 0
+    # a non-zero exit lets CI fail on regressions
+    return 1 if any(status == "slower" for *_, status in rows) else 0
@@ -0,0 +1,1895 @@
+# core.py
+"""
+Number-system and subnetting math for the Visual Tutor: converters, subnet/VLSM planners, batch mode.
+No Tk, reportlab or Pillow here, so scripts and worker processes can import it in a few milliseconds
+(check with `python main.py importtime`). numpy, decimal, csv, json, argparse and multiprocessing load
+on first use, with plain imports inside the functions that need them.
+"""
+
+import importlib.util
+import math
+import io
+import os
+import sys
+import time
+import socket
+import itertools
+import ipaddress
+import heapq
+import bisect
+import functools
+import threading
+from array import array
+from collections import deque, OrderedDict
+from collections.abc import Mapping
+
+# optional numpy for the vectorized bulk subnet engine (imported lazily, see _numpy)
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+# ---------- Utility functions ----------
+# lookup tables built once at import: every octet's binary string, and one row per IPv4 prefix length
+OCTET_BIN = [format(i, '08b') for i in range(256)]
+
+def dotted_bin_8(x):
+    return OCTET_BIN[x] if 0 <= x < 256 else format(x, '08b')
+
+def dotted_bin_32(x):
+    x &= 0xFFFFFFFF
+    return f"{OCTET_BIN[x >> 24]}.{OCTET_BIN[(x >> 16) & 255]}.{OCTET_BIN[(x >> 8) & 255]}.{OCTET_BIN[x & 255]}"
+
+def int_to_dotted(x):
+    return f"{(x >> 24) & 255}.{(x >> 16) & 255}.{(x >> 8) & 255}.{x & 255}"
+
+def _prefix_row(prefix):
+    wildcard = (1 << (32 - prefix)) - 1
+    mask = 0xFFFFFFFF ^ wildcard
+    total = wildcard + 1
+    return {
+        "mask_int": mask,
+        "mask_dec": int_to_dotted(mask),
+        "mask_bin": dotted_bin_32(mask),
+        "mask_bins": dotted_bin_32(mask).split('.'),
+        "wildcard_int": wildcard,
+        "wildcard_dec": int_to_dotted(wildcard),
+        "wildcard_bin": dotted_bin_32(wildcard),
+        "total": total,
+        "usable": total if prefix in (31, 32) else total - 2,
+    }
+
+PREFIX_TABLE = [_prefix_row(p) for p in range(33)]
+
+# ---------- Result cache ----------
+CACHE_MAX_ENTRIES = 256
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+def _approx_size(obj):
+    if isinstance(obj, (tuple, list)):
+        return sys.getsizeof(obj) + sum(_approx_size(o) for o in obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(_approx_size(v) for v in obj.values())
+    return sys.getsizeof(obj)
+
+class ResultCache:
+    # LRU keyed on (function, normalized input, options), bounded by entry count and approximate bytes
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value):
+        size = _approx_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._data[key] = (value, size)
+            self.bytes += size
+            while len(self._data) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._data), "bytes": self.bytes,
+                    "max_entries": self.max_entries, "max_bytes": self.max_bytes}
+
+RESULT_CACHE = ResultCache()
+_MISSING = object()
+
+def memoized(normalize=None):
+    # caches a pure *_steps function in RESULT_CACHE; the input is normalized before keying and calling
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(value, *args, **kwargs):
+            if normalize:
+                value = normalize(value)
+            elif isinstance(value, str):
+                value = value.strip()
+            key = (fn.__name__, value, args, tuple(sorted(kwargs.items())))
+            result = RESULT_CACHE.get(key, _MISSING)
+            if result is _MISSING:
+                result = fn(value, *args, **kwargs)
+                RESULT_CACHE.put(key, result)
+            return result
+        return inner
+    return wrap
+
+# ---------- Instrumentation ----------
+# Named timing spans and counters for the hot paths (compute, text, drawing, animation, PDF).
+# A span is two perf_counter() calls and a locked dict update, cheap enough to leave on;
+# the GUI's diagnostics panel reads snapshot(), and dump() writes the same thing as JSON.
+class _Span:
+    __slots__ = ("metrics", "name", "t0")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.record(self.name, time.perf_counter() - self.t0)
+        return False
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans = {}     # name -> [count, total s, max s, last s]
+        self.counters = {}  # name -> int
+        self.gauges = {}    # name -> last value
+        self.started = time.time()
+
+    def span(self, name):
+        # with METRICS.span("tutor.compute"): ...
+        return _Span(self, name)
+
+    def record(self, name, seconds):
+        with self._lock:
+            s = self.spans.get(name)
+            if s is None:
+                self.spans[name] = [1, seconds, seconds, seconds]
+            else:
+                s[0] += 1
+                s[1] += seconds
+                s[3] = seconds
+                if seconds > s[2]:
+                    s[2] = seconds
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name, value):
+        with self._lock:
+            self.gauges[name] = value
+
+    def reset(self):
+        with self._lock:
+            self.spans.clear()
+            self.counters.clear()
+            self.gauges.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        with self._lock:
+            spans = {name: {"count": c, "total_ms": round(t * 1000, 3), "mean_ms": round(t / c * 1000, 3),
+                            "max_ms": round(m * 1000, 3), "last_ms": round(last * 1000, 3)}
+                     for name, (c, t, m, last) in sorted(self.spans.items())}
+            out = {"since": self.started, "spans": spans, "counters": dict(sorted(self.counters.items())),
+                   "gauges": dict(sorted(self.gauges.items()))}
+        out["cache"] = RESULT_CACHE.stats()
+        return out
+
+    def dump(self, path):
+        import json
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+METRICS = Metrics()
+
+# ---------- Big-number conversion engine ----------
+# Python's own int(str)/str(int) are quadratic and refuse inputs over 4300 digits, so long
+# decimal values go through divide-and-conquer instead.
+STEP_LIMIT = 200          # default number of trace lines shown before the rest is summarized
+STEP_NUM_DIGITS = 1000    # numbers longer than this are abbreviated inside trace lines
+_DC_DIGITS = 2000         # below this size the built-ins are fastest
+
+DIGITS36 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+_pow_cache = {}
+
+def _pow(base, k):
+    if (base, k) not in _pow_cache:
+        _pow_cache[(base, k)] = base ** k
+    return _pow_cache[(base, k)]
+
+def digits_to_int(s, base=10):
+    # hi * base^len(lo) + lo, recursively; multiplication is Karatsuba so this is subquadratic.
+    # power-of-two bases are already linear (and unlimited) in int() itself
+    if len(s) <= _DC_DIGITS or base & (base - 1) == 0:
+        return int(s, base)
+    k = len(s) // 2
+    return digits_to_int(s[:-k], base) * _pow(base, k) + digits_to_int(s[-k:], base)
+
+def decimal_str_to_int(s):
+    return digits_to_int(s, 10)
+
+def int_to_decimal_str(n):
+    if n < 0:
+        return "-" + int_to_decimal_str(-n)
+    if n.bit_length() <= _DC_DIGITS * 3:
+        return str(n)
+    # rebuild the value in base 10 with libmpdec, whose big multiplication is subquadratic
+    import decimal
+    ctx = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+    ctx.traps[decimal.Inexact] = 1
+    pow2 = {}
+    def inner(x, w):
+        if w <= _DC_DIGITS * 3:
+            return decimal.Decimal(x)
+        half = w >> 1
+        if half not in pow2:
+            pow2[half] = ctx.power(decimal.Decimal(2), half)
+        hi, lo = x >> half, x & ((1 << half) - 1)
+        return ctx.add(ctx.multiply(inner(hi, w - half), pow2[half]), inner(lo, half))
+    return format(inner(n, n.bit_length()), 'f')
+
+def int_to_base_str(n, base):
+    if n < 0:
+        return "-" + int_to_base_str(-n, base)
+    if base == 10:
+        return int_to_decimal_str(n)
+    if base in (2, 8, 16):
+        return format(n, {2: 'b', 8: 'o', 16: 'X'}[base])
+    if base & (base - 1) == 0:
+        return _regroup_bits(format(n, 'b'), "", base)[0]
+    if n.bit_length() <= _DC_DIGITS:
+        digits = []
+        while n:
+            n, r = divmod(n, base)
+            digits.append(DIGITS36[r])
+        return "".join(reversed(digits)) or "0"
+    # split on base^k with k about half the digit count, so each half is converted independently
+    k = int(n.bit_length() / math.log2(base)) // 2
+    hi, lo = divmod(n, _pow(base, k))
+    return int_to_base_str(hi, base) + int_to_base_str(lo, base).rjust(k, "0")
+
+def parse_decimal_input(n):
+    if isinstance(n, str):
+        s = n.strip()
+        n = decimal_str_to_int(s) if s.isascii() and s.isdigit() else int(s)
+    n = int(n)
+    if n < 0:
+        raise ValueError("Enter a non-negative whole number")
+    return n
+
+def _num_text(n):
+    # full digits for anything a person would read; huge values keep their last digits and size
+    if n.bit_length() <= STEP_NUM_DIGITS * 3:
+        return str(n)
+    # 10**9 fits in one CPython digit, so this modulo is a single linear pass
+    return f"…{n % 1000000000:09d} (~{int(n.bit_length() * 0.30103) + 1} digits)"
+
+def _shifted_text(v, shift):
+    # _num_text(v << shift) without building the shifted number: the last digits come from a modular power
+    bits = v.bit_length() + shift if v else 0
+    if bits <= STEP_NUM_DIGITS * 3:
+        return str(v << shift)
+    return f"…{v * pow(2, shift, 1000000000) % 1000000000:09d} (~{int(bits * 0.30103) + 1} digits)"
+
+def _capped(lines, total, max_steps, what):
+    # yields at most max_steps lines from the (lazy) iterable, then one summary line
+    if max_steps is None or total <= max_steps:
+        yield from lines
+        return
+    yield from itertools.islice(lines, max_steps)
+    yield f"… {total - max_steps} more {what} omitted"
+
+def _division_trace(n, base, names=None):
+    # power-of-two divisions are shifts; each quotient's text is reused as the next dividend
+    bits = base.bit_length() - 1 if base & (base - 1) == 0 else 0
+    step, t, t_text = 1, n, _num_text(n)
+    while t > 0:
+        q, r = (t >> bits, t & (base - 1)) if bits else divmod(t, base)
+        q_text = _num_text(q)
+        suffix = f" ({names[r]})" if names else ""
+        yield f"Step {step}: {t_text} ÷ {base} = {q_text}, remainder {r}{suffix}"
+        t, t_text = q, q_text
+        step += 1
+
+def _positional_trace(s, bits, names=None):
+    # s is the digit string of a power-of-two base (2^bits); place values are plain shifts
+    p = len(s) - 1
+    for ch in s:
+        v = int(ch, 1 << bits)
+        label = f"{ch} ({v})" if names else ch
+        yield f"{label} × {1 << bits}^{p} = {_shifted_text(v, bits * p)}"
+        p -= 1
+
+def _radix_lines(n, base, fmt, short_name, name, names=None, max_steps=STEP_LIMIT):
+    # input is parsed now (so bad input raises at the call); lines are produced as they are consumed
+    n = parse_decimal_input(n)
+    if n == 0:
+        return iter((f"Step 1: 0 is 0 in {short_name}", f"✅ {name} Result: 0"))
+    digits = format(n, fmt)
+    trace = _capped(_division_trace(n, base, names), len(digits), max_steps, "division steps")
+    return itertools.chain(trace, (f"✅ {name} Result: {digits}",))
+
+def _to_decimal_lines(s, bits, names=None, max_steps=STEP_LIMIT, decimal_text=None):
+    # decimal_text: the result already in base 10 (live mode keeps it incrementally)
+    yield from _capped(_positional_trace(s, bits, names), len(s), max_steps, "digits")
+    yield f"✅ Decimal Result: {decimal_text or int_to_decimal_str(int(s, 1 << bits))}"
+
+# ---------- Converters (step-by-step) ----------
+# each *_lines function returns a lazy iterator of explanation lines; *_steps joins it into one string
+def decimal_to_binary_lines(n, max_steps=STEP_LIMIT):
+    return _radix_lines(n, 2, 'b', "binary", "Binary", max_steps=max_steps)
+
+def decimal_to_octal_lines(n, max_steps=STEP_LIMIT):
+    return _radix_lines(n, 8, 'o', "octal", "Octal", max_steps=max_steps)
+
+def decimal_to_hex_lines(n, max_steps=STEP_LIMIT):
+    return _radix_lines(n, 16, 'X', "hex", "Hexadecimal", names="0123456789ABCDEF", max_steps=max_steps)
+
+def binary_to_decimal_lines(s, max_steps=STEP_LIMIT, decimal_text=None):
+    s = s.strip()
+    if not s:
+        raise ValueError("Empty input")
+    if not set(s) <= set("01"):
+        raise ValueError("Binary must contain only 0 and 1")
+    return _to_decimal_lines(s, 1, max_steps=max_steps, decimal_text=decimal_text)
+
+def octal_to_decimal_lines(s, max_steps=STEP_LIMIT, decimal_text=None):
+    s = s.strip()
+    if not s:
+        raise ValueError("Empty input")
+    if not set(s) <= set("01234567"):
+        raise ValueError("Octal digits must be 0-7")
+    return _to_decimal_lines(s, 3, max_steps=max_steps, decimal_text=decimal_text)
+
+def hex_to_decimal_lines(s, max_steps=STEP_LIMIT, decimal_text=None):
+    s = s.strip().upper()
+    if not s:
+        raise ValueError("Empty input")
+    map16 = "0123456789ABCDEF"
+    if not set(s) <= set(map16):
+        raise ValueError("Hex digits must be 0-9, A-F")
+    return _to_decimal_lines(s, 4, names=map16, max_steps=max_steps, decimal_text=decimal_text)
+
+STREAM_BATCH_LINES = 2000     # lines per batch a streaming job hands to the UI ...
+STREAM_BATCH_SECONDS = 0.05   # ... or fewer, if producing them takes longer than this
+
+def stream_lines(sink, stop, fn, value, *args):
+    # run a *_lines converter and put its lines on `sink` in batches as they are produced, so the first
+    # lines of a huge output show up at once; `stop` (an Event) ends it early. Module level so process
+    # workers can unpickle it. Returns the number of lines delivered.
+    count, batch = 0, []
+    deadline = time.perf_counter() + STREAM_BATCH_SECONDS
+    for line in fn(value, *args):
+        batch.append(line)
+        if len(batch) >= STREAM_BATCH_LINES or time.perf_counter() >= deadline:
+            if stop.is_set():
+                return count
+            sink.put(batch)
+            count += len(batch)
+            batch = []
+            deadline = time.perf_counter() + STREAM_BATCH_SECONDS
+    if batch and not stop.is_set():
+        sink.put(batch)
+        count += len(batch)
+    return count
+
+@memoized()
+def decimal_to_binary_steps(n, max_steps=STEP_LIMIT):
+    return "\n".join(decimal_to_binary_lines(n, max_steps))
+
+@memoized()
+def decimal_to_octal_steps(n, max_steps=STEP_LIMIT):
+    return "\n".join(decimal_to_octal_lines(n, max_steps))
+
+@memoized()
+def decimal_to_hex_steps(n, max_steps=STEP_LIMIT):
+    return "\n".join(decimal_to_hex_lines(n, max_steps))
+
+@memoized()
+def binary_to_decimal_steps(s, max_steps=STEP_LIMIT):
+    return "\n".join(binary_to_decimal_lines(s, max_steps))
+
+@memoized()
+def octal_to_decimal_steps(s, max_steps=STEP_LIMIT):
+    return "\n".join(octal_to_decimal_lines(s, max_steps))
+
+@memoized(normalize=lambda s: s.strip().upper())
+def hex_to_decimal_steps(s, max_steps=STEP_LIMIT):
+    return "\n".join(hex_to_decimal_lines(s, max_steps))
+
+# ---------- Base-N → base-M converter ----------
+FRAC_DIGITS = 32   # fractional digits produced before a non-terminating expansion is cut off
+_BITS_PER_DIGIT = {2: 1, 4: 2, 8: 3, 16: 4, 32: 5}
+_DIGIT_TO_BITS = {b: {DIGITS36[d]: format(d, f'0{k}b') for d in range(b)} for b, k in _BITS_PER_DIGIT.items()}
+_BITS_TO_DIGIT = {b: {bits: d for d, bits in table.items()} for b, table in _DIGIT_TO_BITS.items()}
+
+def _regroup_bits(int_bits, frac_bits, base):
+    # groups of k bits outward from the point: left-pad the whole part, right-pad the fraction
+    k = _BITS_PER_DIGIT[base]
+    table = _BITS_TO_DIGIT[base]
+    int_bits = int_bits.zfill(-(-len(int_bits) // k) * k)
+    frac_bits = frac_bits.ljust(-(-len(frac_bits) // k) * k, "0")
+    int_digits = "".join([table[int_bits[i:i+k]] for i in range(0, len(int_bits), k)]).lstrip("0") or "0"
+    frac_digits = "".join([table[frac_bits[i:i+k]] for i in range(0, len(frac_bits), k)]).rstrip("0")
+    return int_digits, frac_digits
+
+def _parse_base_number(value, base):
+    if not 2 <= base <= 36:
+        raise ValueError("Bases must be between 2 and 36")
+    s = value.strip().upper().replace("_", "")
+    negative = s.startswith("-")
+    if s[:1] in "+-":
+        s = s[1:]
+    int_part, _, frac_part = s.partition(".")
+    if not int_part and not frac_part:
+        raise ValueError("Empty input")
+    if not set(int_part + frac_part) <= set(DIGITS36[:base]):
+        raise ValueError(f"Base-{base} digits must be 0-{DIGITS36[base-1]}")
+    return negative, int_part.lstrip("0") or "0", frac_part.rstrip("0")
+
+def _join_number(negative, int_digits, frac_digits, truncated=False):
+    text = int_digits + ("." + frac_digits if frac_digits else "")
+    if truncated:
+        text += "…"
+    return ("-" if negative and text.strip("0.…") else "") + text
+
+def _regroup_lines(negative, int_part, frac_part, from_base, to_base, max_steps):
+    # both bases are powers of two: digits → bits → digits, no big-number arithmetic at all
+    k_in, k_out = _BITS_PER_DIGIT[from_base], _BITS_PER_DIGIT[to_base]
+    expand = _DIGIT_TO_BITS[from_base]
+    digits = int_part + frac_part
+    yield f"Step 1 — Write each base-{from_base} digit as {k_in} bit{'s' if k_in > 1 else ''}"
+    yield from _capped((f"  {ch} → {expand[ch]}" for ch in digits), len(digits), max_steps, "digits")
+    int_bits = "".join([expand[ch] for ch in int_part])
+    frac_bits = "".join([expand[ch] for ch in frac_part])
+    int_digits, frac_digits = _regroup_bits(int_bits, frac_bits, to_base)
+    yield f"Step 2 — Regroup the bits in {k_out}s, starting at the point"
+    table = _DIGIT_TO_BITS[to_base]
+    out = int_digits + frac_digits
+    yield from _capped((f"  {table[ch]} → {ch}" for ch in out), len(out), max_steps, "groups")
+    yield f"✅ Base-{to_base} Result: {_join_number(negative, int_digits, frac_digits)}"
+
+def _value_trace(int_part, base):
+    # positional expansion for any base; the place value is divided down instead of recomputed
+    place = _pow(base, len(int_part) - 1)
+    p = len(int_part) - 1
+    for ch in int_part:
+        d = DIGITS36.index(ch)
+        label = f"{ch} ({d})" if d >= 10 else ch
+        yield f"  {label} × {base}^{p} = {_num_text(d * place)}"
+        place //= base
+        p -= 1
+
+def _fraction_digits(num, den, to_base, limit):
+    # repeated multiplication by the target base, on exact integers
+    digits = []
+    while num and len(digits) < limit:
+        d, num = divmod(num * to_base, den)
+        digits.append(DIGITS36[d])
+    return "".join(digits), num != 0
+
+def _fraction_trace(num, den, to_base, limit):
+    n = 0
+    while num and n < limit:
+        d, rest = divmod(num * to_base, den)
+        yield f"  {_num_text(num)}/{_num_text(den)} × {to_base} = {d} + {_num_text(rest)}/{_num_text(den)} → digit {DIGITS36[d]}"
+        num, n = rest, n + 1
+
+def _general_lines(negative, int_part, frac_part, from_base, to_base, frac_limit, max_steps):
+    value = digits_to_int(int_part, from_base)
+    yield f"Step 1 — Base-{from_base} whole part to a value"
+    yield from _capped(_value_trace(int_part, from_base), len(int_part), max_steps, "digits")
+    yield f"  Value = {_num_text(value)}"
+    int_digits = int_to_base_str(value, to_base)
+    yield f"Step 2 — Divide by {to_base} repeatedly (remainders read bottom-up)"
+    if value == 0:
+        yield "  0 → 0"
+    else:
+        names = DIGITS36 if to_base > 10 else None
+        divisions = ("  " + line for line in _division_trace(value, to_base, names))
+        yield from _capped(divisions, len(int_digits), max_steps, "division steps")
+    frac_digits, truncated = "", False
+    if frac_part:
+        num, den = digits_to_int(frac_part, from_base), _pow(from_base, len(frac_part))
+        frac_digits, truncated = _fraction_digits(num, den, to_base, frac_limit)
+        yield f"Step 3 — Fraction: multiply by {to_base} repeatedly (whole parts are the digits)"
+        yield from _capped(_fraction_trace(num, den, to_base, frac_limit), len(frac_digits), max_steps, "fraction steps")
+        if truncated:
+            yield f"  (does not terminate in base {to_base}; stopped after {frac_limit} digits)"
+    yield f"✅ Base-{to_base} Result: {_join_number(negative, int_digits, frac_digits, truncated)}"
+
+def _twos_complement_lines(negative, int_part, frac_part, from_base, to_base, width, max_steps):
+    # decimal is the signed value; every other base shows the raw width-bit pattern
+    if frac_part:
+        raise ValueError("Two's complement applies to whole numbers only")
+    if width < 1:
+        raise ValueError("Width must be at least 1 bit")
+    magnitude = digits_to_int(int_part, from_base)
+    lo, hi = -(1 << (width - 1)), (1 << (width - 1)) - 1
+    yield f"Step 1 — Read the input as {width}-bit two's complement"
+    if from_base == 10 or negative:
+        value = -magnitude if negative else magnitude
+        if not lo <= value <= hi:
+            raise ValueError(f"{width}-bit two's complement holds {lo} to {hi}")
+        yield f"  Signed value = {_num_text(value) if value >= 0 else '-' + _num_text(-value)}"
+    else:
+        if magnitude >> width:
+            raise ValueError(f"Pattern does not fit in {width} bits")
+        value = magnitude - (1 << width) if magnitude >> (width - 1) else magnitude
+        if value < 0:
+            yield f"  Top bit is 1, so the value is negative: {_num_text(magnitude)} − 2^{width} = -{_num_text(-value)}"
+        else:
+            yield f"  Top bit is 0, so the value is {_num_text(value)}"
+    if to_base == 10:
+        yield f"✅ Base-10 Result: {int_to_decimal_str(value)}"
+        return
+    pattern = value & ((1 << width) - 1)
+    if value < 0:
+        yield f"Step 2 — Negative: add 2^{width} to get the bit pattern"
+        yield f"  2^{width} − {_num_text(-value)} = {_num_text(pattern)}"
+    else:
+        yield "Step 2 — Non-negative: the bit pattern is the value itself"
+    digits = int_to_base_str(pattern, to_base)
+    k = _BITS_PER_DIGIT.get(to_base)
+    if k:
+        digits = digits.zfill(-(-width // k))
+    yield f"Step 3 — Write the pattern in base {to_base}"
+    yield f"✅ Base-{to_base} Result: {digits}"
+
+def base_to_base_lines(value, from_base, to_base, width=None, frac_digits=FRAC_DIGITS, max_steps=STEP_LIMIT):
+    from_base, to_base = int(from_base), int(to_base)
+    negative, int_part, frac_part = _parse_base_number(value, from_base)
+    if not 2 <= to_base <= 36:
+        raise ValueError("Bases must be between 2 and 36")
+    if width is not None:
+        lines = _twos_complement_lines(negative, int_part, frac_part, from_base, to_base, int(width), max_steps)
+        first = next(lines)   # runs the range checks now rather than on first read
+        return itertools.chain((first,), lines)
+    if from_base in _BITS_PER_DIGIT and to_base in _BITS_PER_DIGIT:
+        return _regroup_lines(negative, int_part, frac_part, from_base, to_base, max_steps)
+    return _general_lines(negative, int_part, frac_part, from_base, to_base, frac_digits, max_steps)
+
+@memoized()
+def base_to_base_steps(value, from_base, to_base, width=None, frac_digits=FRAC_DIGITS, max_steps=STEP_LIMIT):
+    return "\n".join(base_to_base_lines(value, from_base, to_base, width, frac_digits, max_steps))
+
+def base_to_base_tab_lines(value, from_base, to_base, width=""):
+    # the Any Base tab's entry fields, as a module-level function so it can run in a worker process
+    return base_to_base_lines(value, from_base, to_base, width=int(width) if width else None)
+
+# ---------- Live conversion (incremental Horner updates) ----------
+LIVE_DEBOUNCE_MS = 150
+
+@functools.lru_cache(maxsize=None)
+def _live_ctx():
+    import decimal
+    return decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+
+def _decimal_from_digits(s, base):
+    # digits_to_int, but built directly as a libmpdec Decimal (subquadratic multiply, linear to print)
+    if len(s) <= _DC_DIGITS:
+        import decimal
+        return decimal.Decimal(int(s, base))
+    k = len(s) // 2
+    hi, lo = _decimal_from_digits(s[:-k], base), _decimal_from_digits(s[-k:], base)
+    ctx = _live_ctx()
+    return ctx.add(ctx.multiply(hi, ctx.power(base, k)), lo)
+
+class HornerValue:
+    # value of a digit string that is being typed: only the part after the common prefix with the
+    # previous text is re-read (value * base^k + tail to append, value // base^k to erase).
+    # as_decimal keeps the value as a Decimal so its base-10 text is a linear format() call.
+    def __init__(self, base, as_decimal=False):
+        self.base = base
+        self.as_decimal = as_decimal
+        self.text = ""
+        if as_decimal:
+            import decimal
+            self.value = decimal.Decimal(0)
+        else:
+            self.value = 0
+
+    def update(self, s):
+        old, base = self.text, self.base
+        k = len(os.path.commonprefix([old, s]))
+        drop, tail = len(old) - k, s[k:]
+        if self.as_decimal:
+            ctx = _live_ctx()
+            if drop:
+                self.value = ctx.divide_int(self.value, ctx.power(base, drop))
+            if tail:
+                self.value = ctx.add(ctx.multiply(self.value, ctx.power(base, len(tail))), _decimal_from_digits(tail, base))
+        else:
+            if drop:
+                self.value //= _pow(base, drop)
+            if tail:
+                self.value = self.value * _pow(base, len(tail)) + digits_to_int(tail, base)
+        self.text = s
+        return self.value
+
+    def decimal_text(self):
+        return format(self.value, 'f') if self.as_decimal else int_to_decimal_str(self.value)
+
+# ---------- Network verbose helpers ----------
+def parse_ipv4_cidr(subnet_str):
+    # returns (ip_int, prefix) for "a.b.c.d/nn"; other forms (netmask, no prefix) go through ipaddress
+    ip_text, _, prefix_text = subnet_str.strip().partition('/')
+    try:
+        try:
+            # inet_pton is as strict as ipaddress (no leading zeros, 4 octets) but much cheaper
+            ip_int = int.from_bytes(socket.inet_pton(socket.AF_INET, ip_text), 'big')
+        except OSError:
+            ip_int = int(ipaddress.IPv4Address(ip_text))
+        if prefix_text.isdigit() and len(prefix_text) <= 2 and int(prefix_text) <= 32:
+            return ip_int, int(prefix_text)
+        return ip_int, ipaddress.IPv4Network(subnet_str.strip(), strict=False).prefixlen
+    except Exception:
+        raise ValueError("Invalid IPv4 network. Use e.g. 172.54.1.0/26")
+
+def ipv4_subnet_ints(ip_int, prefix):
+    # integer-only version of the viz math: (network, broadcast, first, last, total, usable)
+    row = PREFIX_TABLE[prefix]
+    network = ip_int & row["mask_int"]
+    broadcast = network | row["wildcard_int"]
+    if prefix in (31, 32):
+        return network, broadcast, network, broadcast, row["total"], row["usable"]
+    return network, broadcast, network + 1, broadcast - 1, row["total"], row["usable"]
+
+class IPv4Subnet(Mapping):
+    # one computed subnet stored as two ints; every other field (numbers and strings) is derived on access.
+    # It is a read-only Mapping over FIELDS with the old viz dict's keys and values (r["network"], r.get(...),
+    # items(), len(r), dict(r)), so the tutor and export code use it unchanged, but it costs ~80 bytes instead
+    # of a 17-key dict of strings. json only serializes real dicts: json.dumps(r.as_dict()).
+    __slots__ = ("ip_int", "prefix")
+    FIELDS = ("prefix", "mask_dec", "mask_bins", "ip_dec", "ip_bins", "network", "network_int", "broadcast_int",
+              "network_bin", "broadcast", "broadcast_bin", "total", "usable", "first", "last", "host_bits",
+              "mask_int", "host_mask_int")
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(self, ip_int, prefix):
+        self.ip_int = ip_int
+        self.prefix = prefix
+
+    # ----- integers -----
+    @property
+    def host_bits(self):
+        return 32 - self.prefix
+
+    @property
+    def mask_int(self):
+        return PREFIX_TABLE[self.prefix]["mask_int"]
+
+    @property
+    def host_mask_int(self):
+        return PREFIX_TABLE[self.prefix]["wildcard_int"]
+
+    @property
+    def network_int(self):
+        return self.ip_int & PREFIX_TABLE[self.prefix]["mask_int"]
+
+    @property
+    def broadcast_int(self):
+        return self.network_int | PREFIX_TABLE[self.prefix]["wildcard_int"]
+
+    @property
+    def first_int(self):
+        return self.network_int + (self.prefix < 31)
+
+    @property
+    def last_int(self):
+        return self.broadcast_int - (self.prefix < 31)
+
+    @property
+    def total(self):
+        return PREFIX_TABLE[self.prefix]["total"]
+
+    @property
+    def usable(self):
+        return PREFIX_TABLE[self.prefix]["usable"]
+
+    # ----- strings -----
+    @property
+    def ip_dec(self):
+        return int_to_dotted(self.ip_int)
+
+    @property
+    def ip_bins(self):
+        return [OCTET_BIN[(self.ip_int >> s) & 255] for s in (24, 16, 8, 0)]
+
+    @property
+    def mask_dec(self):
+        return PREFIX_TABLE[self.prefix]["mask_dec"]
+
+    @property
+    def mask_bins(self):
+        return list(PREFIX_TABLE[self.prefix]["mask_bins"])
+
+    @property
+    def network(self):
+        return int_to_dotted(self.network_int)
+
+    @property
+    def network_bin(self):
+        return dotted_bin_32(self.network_int)
+
+    @property
+    def broadcast(self):
+        return int_to_dotted(self.broadcast_int)
+
+    @property
+    def broadcast_bin(self):
+        return dotted_bin_32(self.broadcast_int)
+
+    @property
+    def first(self):
+        return int_to_dotted(self.first_int)
+
+    @property
+    def last(self):
+        return int_to_dotted(self.last_int)
+
+    # ----- mapping view (old viz dict) -----
+    def __getitem__(self, key):
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __contains__(self, key):
+        return key in self._FIELD_SET
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._FIELD_SET else default
+
+    def keys(self):
+        return self.FIELDS
+
+    def as_dict(self):
+        return {k: getattr(self, k) for k in self.FIELDS}
+
+    def __eq__(self, other):
+        if isinstance(other, IPv4Subnet):
+            return (self.ip_int, self.prefix) == (other.ip_int, other.prefix)
+        # against a plain dict (e.g. an old viz dict): equal when every field matches
+        return Mapping.__eq__(self, other)
+
+    def __hash__(self):
+        return hash((self.ip_int, self.prefix))
+
+    def __repr__(self):
+        return f"IPv4Subnet({int_to_dotted(self.ip_int)}/{self.prefix})"
+
+class IPv4Result(IPv4Subnet):
+    # compute-only result: the record plus the input text; the explanation is built on first use
+    __slots__ = ("subnet_str", "_text")
+
+    def __init__(self, subnet_str, ip_int, prefix):
+        IPv4Subnet.__init__(self, ip_int, prefix)
+        self.subnet_str = subnet_str
+        self._text = None
+
+    @property
+    def viz(self):
+        return IPv4Subnet(self.ip_int, self.prefix)
+
+    def explain(self, simple_mode=False):
+        simple_mode = bool(simple_mode)
+        if self._text is None:
+            self._text = {}
+        if simple_mode not in self._text:
+            self._text[simple_mode] = "\n".join(_ipv4_explanation_lines(self, simple_mode))
+        return self._text[simple_mode]
+
+def _ipv4_explanation_lines(r, simple_mode):
+    prefix, host_bits, total = r.prefix, r.host_bits, r.total
+    row = PREFIX_TABLE[prefix]
+    network = int_to_dotted(r.network_int)
+    broadcast = int_to_dotted(r.broadcast_int)
+    mask = row["mask_dec"]
+    if simple_mode:
+        yield f"Input: {r.subnet_str}"
+        yield ""
+        yield "Simple English Summary:"
+        yield f"  • Think: network bits = building address; host bits = room numbers"
+        yield f"  • /{prefix} → {prefix} building bits, {host_bits} room bits"
+        yield f"  • Rooms (addresses) = 2^{host_bits} = {total}"
+        if prefix not in (31,32):
+            yield f"  • Usable rooms = {total-2} (usually)"
+        yield ""
+        yield f"Network (start): {network}"
+        yield f"Broadcast (announce to all): {broadcast}"
+        return
+    yield f"Input: {r.subnet_str}\n"
+    yield "STEP 1 — Prefix"
+    yield f"  • /{prefix} → network bits = {prefix}, host bits = {host_bits}\n"
+    yield "STEP 2 — Netmask"
+    yield f"  • Mask (binary): {row['mask_bin']}"
+    yield f"  • Mask (decimal): {mask}"
+    yield "STEP 3 — IP to binary"
+    yield f"  • IP: {int_to_dotted(r.ip_int)} → {dotted_bin_32(r.ip_int)}"
+    yield "STEP 4 — Network (IP AND Mask)"
+    yield f"  • AND result (binary): {dotted_bin_32(r.network_int)}"
+    yield f"  • Network address: {network}"
+    yield "STEP 5 — Broadcast"
+    yield f"  • Host mask (inverse): {row['wildcard_bin']}"
+    yield f"  • Broadcast: {broadcast}"
+    yield "STEP 6 — Counts"
+    yield f"  • 2^{host_bits} = {total} total addresses"
+    yield f"  • Usable hosts (typical): {r.usable}"
+    yield "\nSTEP 7 — Summary"
+    yield f"  Network: {network}/{prefix}"
+    yield f"  Netmask: {mask}"
+    yield f"  Broadcast: {broadcast}"
+    yield f"  Total addresses: {total}"
+    yield f"  Usable hosts: {r.usable}"
+    if prefix not in (31,32):
+        yield f"  First usable: {int_to_dotted(r.first_int)}"
+        yield f"  Last usable: {int_to_dotted(r.last_int)}"
+
+def ipv4_compute(subnet_str):
+    ip_int, prefix = parse_ipv4_cidr(subnet_str)
+    return IPv4Result(subnet_str, ip_int, prefix)
+
+@memoized()
+def ipv4_steps_verbose(subnet_str, simple_mode=False):
+    res = ipv4_compute(subnet_str)
+    return res.explain(simple_mode), res.viz
+
+# ---------- Columnar IPv4 results ----------
+# For batch analysis of millions of subnets: one uint32 column of addresses and one uint8 column of
+# prefixes (5 bytes a subnet). Rows come back as IPv4Subnet records; whole derived columns come from
+# the vectorized engine when numpy is installed.
+_U32 = "I" if array("I").itemsize == 4 else "L"
+
+class IPv4SubnetTable:
+    __slots__ = ("addrs", "prefixes")
+
+    def __init__(self, addrs=(), prefixes=()):
+        self.addrs = array(_U32, addrs)
+        self.prefixes = array("B", prefixes)
+        if len(self.addrs) != len(self.prefixes):
+            raise ValueError("Addresses and prefixes must have the same length")
+
+    @classmethod
+    def from_cidrs(cls, cidrs, skip_invalid=False):
+        table = cls()
+        for c in cidrs:
+            try:
+                ip_int, prefix = parse_ipv4_cidr(c)
+            except ValueError:
+                if skip_invalid:
+                    continue
+                raise
+            table.addrs.append(ip_int)
+            table.prefixes.append(prefix)
+        return table
+
+    def append(self, ip_int, prefix):
+        if not 0 <= prefix <= 32:
+            raise ValueError("Prefix lengths must be between 0 and 32")
+        self.addrs.append(ip_int)
+        self.prefixes.append(prefix)
+
+    def __len__(self):
+        return len(self.addrs)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            table = IPv4SubnetTable()
+            table.addrs, table.prefixes = self.addrs[i], self.prefixes[i]
+            return table
+        return IPv4Subnet(self.addrs[i], self.prefixes[i])
+
+    def __iter__(self):
+        return map(IPv4Subnet, self.addrs, self.prefixes)
+
+    @property
+    def nbytes(self):
+        return len(self.addrs) * self.addrs.itemsize + len(self.prefixes)
+
+    def arrays(self):
+        # zero-copy numpy views of the two stored columns
+        np = _numpy()
+        return np.frombuffer(self.addrs, dtype=np.uint32), np.frombuffer(self.prefixes, dtype=np.uint8)
+
+    def column(self, field):
+        # one derived field for every row: a numpy array for the vectorized fields, else a list
+        if NUMPY_AVAILABLE and field in _VECTOR_FIELDS:
+            return ipv4_subnets_vectorized(*self.arrays())[_VECTOR_FIELDS[field]]
+        if field not in IPv4Subnet._FIELD_SET and field not in _VECTOR_FIELDS and field != "ip_int":
+            raise KeyError(field)
+        return [getattr(r, field) for r in self]
+
+# ---------- Vectorized IPv4 engine (numpy) ----------
+# numpy costs ~100 ms to import, so it is loaded by the first vectorized call rather than at startup
+def _numpy():
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("Install numpy for bulk subnet math: pip install numpy")
+    import numpy
+    return numpy
+
+@functools.lru_cache(maxsize=None)
+def _host_mask_table():
+    np = _numpy()
+    return np.array([row["wildcard_int"] for row in PREFIX_TABLE], dtype=np.uint32)
+
+_PREFIX_LENGTHS = {str(p): p for p in range(33)}
+
+def pack_ipv4_cidrs(cidrs, errors=None):
+    # "a.b.c.d/nn" strings -> (addresses as concatenated 4-byte big-endian values, array("B") of prefixes),
+    # with no Python int or tuple per row. Bad entries raise, or are recorded in `errors` as
+    # {position: message} and packed as 0.0.0.0/32 so the columns stay aligned with the input.
+    packed, prefixes = [], array("B")
+    pton, af4 = socket.inet_pton, socket.AF_INET
+    lengths = _PREFIX_LENGTHS
+    for i, text in enumerate(cidrs):
+        ip_text, _, prefix_text = text.partition("/")
+        prefix = lengths.get(prefix_text)
+        if prefix is not None:
+            try:
+                packed.append(pton(af4, ip_text))
+                prefixes.append(prefix)
+                continue
+            except OSError:
+                pass
+        # netmask or bare-address forms, stray whitespace, and errors
+        try:
+            ip_int, prefix = parse_ipv4_cidr(text)
+        except ValueError as e:
+            if errors is None:
+                raise
+            errors[i] = str(e)
+            ip_int, prefix = 0, 32
+        packed.append(ip_int.to_bytes(4, "big"))
+        prefixes.append(prefix)
+    return b"".join(packed), prefixes
+
+def cidrs_to_arrays(cidrs, errors=None):
+    # list of "a.b.c.d/nn" strings -> (uint32 addresses, uint8 prefixes)
+    np = _numpy()
+    packed, prefixes = pack_ipv4_cidrs(cidrs, errors)
+    return np.frombuffer(packed, dtype=">u4").astype(np.uint32), np.frombuffer(prefixes, dtype=np.uint8).copy()
+
+def ipv4_subnets_vectorized(addrs, prefixes):
+    # same answers as IPv4Subnet, one array per field (addresses as uint32, counts as uint64)
+    np = _numpy()
+    addrs = np.asarray(addrs, dtype=np.uint32)
+    prefixes = np.asarray(prefixes)
+    if prefixes.size and (prefixes.min() < 0 or prefixes.max() > 32):
+        raise ValueError("Prefix lengths must be between 0 and 32")
+    # table lookup avoids the undefined 32-bit shift for /0
+    host_mask = _host_mask_table()[prefixes.astype(np.intp)]
+    addrs, host_mask = np.broadcast_arrays(addrs, host_mask)
+    network = addrs & ~host_mask
+    broadcast = network | host_mask
+    total = host_mask.astype(np.uint64) + 1
+    point_to_point = np.broadcast_to(prefixes >= 31, network.shape)
+    edge = (~point_to_point).astype(np.uint32)
+    return {
+        "network": network,
+        "broadcast": broadcast,
+        "mask_int": ~host_mask,
+        "host_mask_int": host_mask,
+        "first": network + edge,
+        "last": broadcast - edge,
+        "total": total,
+        "usable": total - 2 * edge.astype(np.uint64),
+    }
+
+# IPv4Subnet field -> ipv4_subnets_vectorized key
+_VECTOR_FIELDS = {"network_int": "network", "broadcast_int": "broadcast", "mask_int": "mask_int",
+                  "host_mask_int": "host_mask_int", "first_int": "first", "last_int": "last",
+                  "total": "total", "usable": "usable"}
+
+def ipv4_prefixes_for_hosts_vectorized(hosts):
+    # bulk VLSM sizing: int array of host counts -> int16 prefixes (-1 where nothing fits)
+    np = _numpy()
+    h = np.asarray(hosts, dtype=np.int64)
+    # frexp's exponent is bit_length(h + 1); exact for anything that can still fit in IPv4
+    s = np.frexp((h + 1).astype(np.float64))[1]
+    s = np.where(h <= 1, 0, np.where(h == 2, 1, s))
+    return np.where(s <= 32, 32 - s, -1).astype(np.int16)
+
+# ---------- Hosts → prefix solver ----------
+def ipv4_prefix_for_hosts(hosts_required):
+    # smallest prefix whose usable count covers the hosts: /32 → 1, /31 → 2, otherwise 2^s - 2
+    if hosts_required <= 1:
+        return 32
+    if hosts_required == 2:
+        return 31
+    s = (hosts_required + 1).bit_length()
+    return 32 - s if s <= 32 else None
+
+def ipv4_prefixes_for_hosts(hosts_list):
+    return [ipv4_prefix_for_hosts(int(h)) for h in hosts_list]
+
+def hosts_to_ipv4(hosts_required):
+    prefix = ipv4_prefix_for_hosts(int(hosts_required))
+    if prefix is None:
+        return None
+    row = PREFIX_TABLE[prefix]
+    return {"prefix": prefix, "total": row["total"], "usable": row["usable"]}
+
+def hosts_to_ipv4_trace(hosts_required, simple_mode=False):
+    # the "Test s=..." walk shown in the tutor; only generated when the text is wanted
+    hosts_required = int(hosts_required)
+    if simple_mode:
+        yield f"Need {hosts_required} hosts. Find smallest block."
+    else:
+        yield f"Input: needed hosts = {hosts_required}"
+    prefix = ipv4_prefix_for_hosts(hosts_required)
+    last_s = 32 if prefix is None else 32 - prefix
+    for s in range(0, last_s+1):
+        row = PREFIX_TABLE[32 - s]
+        yield f"Test s={s}: total={row['total']}, usable={row['usable']}"
+    if prefix is None:
+        yield "No suitable prefix found."
+    else:
+        row = PREFIX_TABLE[prefix]
+        yield f"Found: /{prefix} (total {row['total']}, usable {row['usable']})"
+
+@memoized(normalize=int)
+def hosts_to_ipv4_steps(hosts_required, simple_mode=False):
+    return "\n".join(hosts_to_ipv4_trace(hosts_required, simple_mode)), hosts_to_ipv4(hosts_required)
+
+@memoized()
+def ipv6_steps_verbose(subnet_str, simple_mode=False):
+    try:
+        net = ipaddress.IPv6Network(subnet_str, strict=False)
+    except Exception:
+        raise ValueError("Invalid IPv6 network. Use e.g. 2001:db8::/64")
+    prefix = net.prefixlen
+    total = net.num_addresses
+    host_bits = 128 - prefix
+    lines = []
+    if simple_mode:
+        lines.append(f"Input: {subnet_str}")
+        lines.append(f"/{prefix} → host bits = {host_bits}, total = 2^{host_bits} = {total}")
+    else:
+        lines.append(f"Input: {subnet_str}")
+        lines.append(f"/{prefix} → host bits = {host_bits}")
+        mask_int = ((1<<128)-1) ^ ((1<<(128-prefix))-1) if prefix != 0 else 0
+        groups = [format((mask_int >> (112 - i*16)) & 0xFFFF, '016b') for i in range(8)]
+        lines.append("Mask grouped (16-bit):")
+        lines.append("  " + " ".join(groups))
+        lines.append(f"Network: {net.network_address}/{prefix}")
+        lines.append(f"Total addresses: {total}")
+    mask_int = ((1<<128)-1) ^ ((1<<(128-prefix))-1) if prefix != 0 else 0
+    groups = [format((mask_int >> (112 - i*16)) & 0xFFFF, '016b') for i in range(8)]
+    hextets = [format((int(net.network_address) >> (112 - i*16)) & 0xFFFF, '04x') for i in range(8)]
+    viz = {"prefix": prefix, "groups": groups, "hextets": hextets, "total": total, "host_bits": host_bits, "network": str(net.network_address)}
+    return "\n".join(lines), viz
+
+def ipv6_prefix_for_hosts(hosts_required):
+    # IPv6 has no reserved network/broadcast, so it is just the smallest 2^s >= hosts
+    s = (hosts_required - 1).bit_length() if hosts_required > 1 else 0
+    return 128 - s if s <= 128 else None
+
+def ipv6_prefixes_for_hosts(hosts_list):
+    return [ipv6_prefix_for_hosts(int(h)) for h in hosts_list]
+
+@memoized(normalize=int)
+def hosts_to_ipv6_steps(hosts_required, simple_mode=False):
+    prefix = ipv6_prefix_for_hosts(int(hosts_required))
+    if prefix is None:
+        return "No suitable IPv6 prefix found.", None
+    s, total = 128 - prefix, 1 << (128 - prefix)
+    return f"Found s={s} → prefix /{prefix}, total {total}", {"prefix": prefix, "total": total}
+
+# ---------- VLSM planner (buddy allocator over integer ranges) ----------
+class BuddyAllocator:
+    # free blocks kept per prefix length as min-heaps of start addresses, so allocation is lowest-address-first
+    def __init__(self, start, prefix, width=32):
+        self.width = width
+        self.base_prefix = prefix
+        self.free = [[] for _ in range(width + 1)]
+        self.free[prefix].append(start)
+
+    def allocate(self, prefix):
+        p = prefix
+        while p >= self.base_prefix and not self.free[p]:
+            p -= 1
+        if p < self.base_prefix:
+            return None
+        start = heapq.heappop(self.free[p])
+        # split down to the requested size, keeping each upper buddy on its free list
+        while p < prefix:
+            p += 1
+            heapq.heappush(self.free[p], start + (1 << (self.width - p)))
+        return start
+
+    def free_blocks(self):
+        return sorted((s, p) for p, starts in enumerate(self.free) for s in starts)
+
+def format_addr(x, width=32):
+    return int_to_dotted(x) if width == 32 else str(ipaddress.IPv6Address(x))
+
+def vlsm_allocate(base_str, hosts_list):
+    try:
+        base = ipaddress.ip_network(base_str.strip(), strict=False)
+    except Exception:
+        raise ValueError("Invalid base network. Use e.g. 10.0.0.0/16")
+    width = base.max_prefixlen
+    solve = ipv4_prefix_for_hosts if width == 32 else ipv6_prefix_for_hosts
+    hosts = [int(h) for h in hosts_list]
+    prefixes = [solve(h) for h in hosts]
+    allocator = BuddyAllocator(int(base.network_address), base.prefixlen, width)
+    allocations, unplaced = [], []
+    # largest block (smallest prefix) first; ties keep input order
+    for i in sorted(range(len(hosts)), key=lambda i: (prefixes[i] is None, prefixes[i] or 0)):
+        prefix = prefixes[i]
+        start = None if prefix is None or prefix < base.prefixlen else allocator.allocate(prefix)
+        if start is None:
+            unplaced.append(i)
+        else:
+            allocations.append({"index": i, "hosts": hosts[i], "prefix": prefix, "network_int": start})
+    free = allocator.free_blocks()
+    return {
+        "base": str(base),
+        "width": width,
+        "allocations": allocations,
+        "unplaced": unplaced,
+        "hosts": hosts,
+        "free": free,
+        "free_addresses": sum(1 << (width - p) for _, p in free),
+    }
+
+def vlsm_steps(base_str, hosts_list, simple_mode=False):
+    plan = vlsm_allocate(base_str, hosts_list)
+    width = plan["width"]
+    lines = []
+    if simple_mode:
+        lines.append(f"Base: {plan['base']} — think of it as one big plot of land.")
+        lines.append("Each request is a building; we place the biggest buildings first so nothing gets stuck.")
+    else:
+        lines.append(f"Base: {plan['base']}")
+        lines.append(f"Requests: {len(plan['hosts'])} subnets, allocated largest first (buddy splitting)")
+    lines.append("")
+    for a in plan["allocations"]:
+        start, size = a["network_int"], 1 << (width - a["prefix"])
+        lines.append(f"  • #{a['index']+1}: {a['hosts']} hosts → {format_addr(start, width)}/{a['prefix']}"
+                     f" ({format_addr(start, width)} - {format_addr(start + size - 1, width)})")
+    if plan["unplaced"]:
+        lines.append("")
+        lines.append(f"Did not fit ({len(plan['unplaced'])}): " +
+                     ", ".join(f"#{i+1} ({plan['hosts'][i]} hosts)" for i in plan["unplaced"]))
+    lines.append("")
+    lines.append(f"Free space left: {plan['free_addresses']} addresses in {len(plan['free'])} blocks")
+    for start, prefix in plan["free"]:
+        lines.append(f"  • {format_addr(start, width)}/{prefix}")
+    return "\n".join(lines), plan
+
+# ---------- Host map rasterization ----------
+# Address ranges -> a w*h grid of colours, each pixel aggregating view_count/(w*h) addresses.
+# Pure data, shared by the Tk host map (gui) and the PDF drawings (export).
+HOST_MAP_W, HOST_MAP_H = 512, 128
+HOST_COLORS = {"network": "#95a5a6", "usable": "#3498db", "broadcast": "#e67e22", "free": "#34495e"}
+BLOCK_COLORS = ("#2ecc71", "#9b59b6", "#f1c40f", "#1abc9c", "#e74c3c", "#3498db")
+
+def host_map_pixels(view_start, view_count, spans, width=HOST_MAP_W, height=HOST_MAP_H, background="#222222"):
+    # spans: [(start, end_exclusive, color)] painted in order, later ones win; a span smaller than a pixel
+    # still gets one pixel so single addresses (network/broadcast) stay visible at any zoom
+    n = width * height
+    px = [background] * n
+    view_end = view_start + view_count
+    for a, b, color in spans:
+        a, b = max(a, view_start), min(b, view_end)
+        if a >= b:
+            continue
+        p0 = (a - view_start) * n // view_count
+        p1 = max(p0 + 1, -(-(b - view_start) * n // view_count))
+        px[p0:p1] = [color] * (p1 - p0)
+    return px
+
+def ipv4_host_spans(network, broadcast, prefix):
+    if prefix >= 31:
+        return [(network, broadcast + 1, HOST_COLORS["usable"])]
+    return [(network + 1, broadcast, HOST_COLORS["usable"]),
+            (network, network + 1, HOST_COLORS["network"]),
+            (broadcast, broadcast + 1, HOST_COLORS["broadcast"])]
+
+def vlsm_host_spans(plan):
+    spans = []
+    for i, a in enumerate(plan["allocations"]):
+        size = 1 << (plan["width"] - a["prefix"])
+        spans.append((a["network_int"], a["network_int"] + size, BLOCK_COLORS[i % len(BLOCK_COLORS)]))
+    return spans
+
+# ---------- Lazy subnet sequence ----------
+class SubnetSequence:
+    # stand-in for list(base.subnets(new_prefix=...)): len, indexing, slicing and lookup are all arithmetic
+    def __init__(self, base, new_prefix, _indices=None):
+        if isinstance(base, str):
+            base = ipaddress.ip_network(base.strip(), strict=False)
+        if not base.prefixlen <= new_prefix <= base.max_prefixlen:
+            raise ValueError(f"/{new_prefix} does not fit inside {base}")
+        self.base = base
+        self.new_prefix = new_prefix
+        self._start = int(base.network_address)
+        self._size = 1 << (base.max_prefixlen - new_prefix)
+        self._indices = range(1 << (new_prefix - base.prefixlen)) if _indices is None else _indices
+
+    @property
+    def count(self):
+        # len() is capped at sys.maxsize; IPv6 splits can be far larger
+        return self._indices.stop - self._indices.start if self._indices.step == 1 else len(self._indices)
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return SubnetSequence(self.base, self.new_prefix, self._indices[i])
+        return type(self.base)((self._start + self._indices[i] * self._size, self.new_prefix))
+
+    def __iter__(self):
+        for n in self._indices:
+            yield type(self.base)((self._start + n * self._size, self.new_prefix))
+
+    def index_of(self, ip):
+        # position of the subnet that contains ip
+        ip_int = int(ipaddress.ip_address(ip.strip() if isinstance(ip, str) else ip))
+        offset = ip_int - self._start
+        if ip_int.bit_length() > self.base.max_prefixlen or not 0 <= offset < self.base.num_addresses:
+            raise ValueError(f"{ip} is not inside {self.base}")
+        n = offset // self._size
+        if n not in self._indices:
+            # ip is in the base network, but this (sliced) sequence skips its subnet
+            subnet = type(self.base)((self._start + n * self._size, self.new_prefix))
+            raise ValueError(f"{subnet} (which contains {ip}) is not in this selection of /{self.new_prefix} subnets of {self.base}")
+        return self._indices.index(n)
+
+    def containing(self, ip):
+        return self[self.index_of(ip)]
+
+# ---------- Longest-prefix match index ----------
+# "Which of my networks does this address belong to?" The networks (IPv4 and IPv6, any nesting) are
+# swept once into sorted, disjoint address intervals, each owned by the most specific network that
+# covers it. A lookup is then a single binary search, so it costs the same for 10 networks or 1M;
+# bulk IPv4 lookups run through np.searchsorted when numpy is installed.
+IPV6_MASKS = [((1 << 128) - 1) ^ ((1 << (128 - p)) - 1) for p in range(129)]
+
+def parse_ipv6_cidr(subnet_str):
+    # returns (ip_int, prefix) for "addr/nn"; a bare address is a /128
+    ip_text, _, prefix_text = subnet_str.strip().partition('/')
+    try:
+        ip_int = int.from_bytes(socket.inet_pton(socket.AF_INET6, ip_text), 'big')
+    except (OSError, ValueError):
+        raise ValueError("Invalid IPv6 network. Use e.g. 2001:db8::/64")
+    if not prefix_text:
+        return ip_int, 128
+    if prefix_text.isdigit() and len(prefix_text) <= 3 and int(prefix_text) <= 128:
+        return ip_int, int(prefix_text)
+    raise ValueError("Invalid IPv6 network. Use e.g. 2001:db8::/64")
+
+def parse_network(text):
+    # "a.b.c.d/nn" or an IPv6 prefix -> (version, network_int, prefix), host bits cleared with the usual masks
+    if ":" in text:
+        ip_int, prefix = parse_ipv6_cidr(text)
+        return 6, ip_int & IPV6_MASKS[prefix], prefix
+    ip_int, prefix = parse_ipv4_cidr(text if "/" in text else text.strip() + "/32")
+    return 4, ip_int & PREFIX_TABLE[prefix]["mask_int"], prefix
+
+def parse_address(text):
+    # one IPv4 or IPv6 address -> (version, int)
+    text = text.strip()
+    try:
+        if ":" in text:
+            return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, text), 'big')
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, text), 'big')
+    except (OSError, ValueError):
+        raise ValueError(f"Invalid IP address: {text!r}")
+
+def _interval_table(items, width, parent):
+    # items: (start, prefix, end, index) per network. A stack sweep over the nesting turns them into
+    # (bounds, owners): owners[i] (-1 = none) owns the addresses from bounds[i] up to bounds[i+1].
+    items.sort()  # by start, and the wider network first when two start together
+    bounds, owners = [0], [-1]
+    limit = 1 << width
+
+    def emit(pos, owner):
+        if pos >= limit:
+            return
+        if bounds[-1] == pos:
+            owners[-1] = owner
+            if len(owners) > 1 and owners[-2] == owner:
+                bounds.pop()
+                owners.pop()
+        elif owners[-1] != owner:
+            bounds.append(pos)
+            owners.append(owner)
+
+    stack = []  # (end, index) of the networks enclosing the current position
+    for start, _, end, idx in items:
+        while stack and stack[-1][0] < start:
+            e, _ = stack.pop()
+            emit(e + 1, stack[-1][1] if stack else -1)
+        parent[idx] = stack[-1][1] if stack else -1
+        emit(start, idx)
+        stack.append((end, idx))
+    while stack:
+        e, _ = stack.pop()
+        emit(e + 1, stack[-1][1] if stack else -1)
+    return bounds, owners
+
+class PrefixIndex:
+    def __init__(self, entries=()):
+        # entries: CIDR strings or (cidr, label) pairs; exact duplicates keep their first label
+        self.versions = array("B")
+        self.network_ints = []
+        self.prefixes = array("B")
+        self.labels = []
+        self.duplicates = 0
+        seen = {}
+        items = {4: [], 6: []}
+        for entry in entries:
+            cidr, label = (entry, "") if isinstance(entry, str) else entry
+            key = parse_network(cidr)
+            idx = seen.setdefault(key, len(self.network_ints))
+            if idx != len(self.network_ints):
+                self.duplicates += 1
+                continue
+            version, net, prefix = key
+            self.versions.append(version)
+            self.network_ints.append(net)
+            self.prefixes.append(prefix)
+            self.labels.append(label)
+            host_bits = (32 if version == 4 else 128) - prefix
+            items[version].append((net, prefix, net | ((1 << host_bits) - 1), idx))
+        self.parent = [-1] * len(self.network_ints)
+        self._tables = {4: _interval_table(items[4], 32, self.parent), 6: _interval_table(items[6], 128, self.parent)}
+        self._np4 = None
+        self._names = {}
+
+    def __len__(self):
+        return len(self.network_ints)
+
+    def network(self, i):
+        # formatted once per network: bulk output repeats the same few names many times
+        name = self._names.get(i)
+        if name is None:
+            width = 32 if self.versions[i] == 4 else 128
+            name = self._names[i] = f"{format_addr(self.network_ints[i], width)}/{self.prefixes[i]}"
+        return name
+
+    def intervals(self, version=4):
+        # number of disjoint intervals a lookup searches (at most 2 per network + 1)
+        return len(self._tables[version][0])
+
+    def lookup_int(self, version, addr):
+        # index of the longest matching network, or None
+        bounds, owners = self._tables[version]
+        owner = owners[bisect.bisect_right(bounds, addr) - 1]
+        return None if owner < 0 else owner
+
+    def lookup(self, address):
+        return self.lookup_int(*parse_address(address))
+
+    def lookup_ints(self, version, addrs):
+        # bulk form of lookup_int -> list of indices, -1 where nothing matches
+        bounds, owners = self._tables[version]
+        if version == 4 and NUMPY_AVAILABLE and len(addrs) > 64:
+            np = _numpy()
+            if self._np4 is None:
+                self._np4 = (np.array(bounds, dtype=np.uint32), np.array(owners, dtype=np.int64))
+            nb, no = self._np4
+            a = np.frombuffer(addrs, dtype=np.uint32) if isinstance(addrs, array) else np.asarray(addrs, dtype=np.uint32)
+            return no[np.searchsorted(nb, a, side="right") - 1].tolist()
+        search = bisect.bisect_right
+        return [owners[search(bounds, a) - 1] for a in addrs]
+
+    def lookup_packed4(self, packed):
+        # IPv4 addresses as concatenated 4-byte big-endian values (inet_pton output) -> lookup_ints
+        addrs = array(_U32, packed)
+        if sys.byteorder == "little":
+            addrs.byteswap()
+        return self.lookup_ints(4, addrs)
+
+    def covering(self, i):
+        # the matched network and every network that contains it, longest prefix first
+        chain = []
+        while i is not None and i >= 0:
+            chain.append(i)
+            i = self.parent[i]
+        return chain
+
+def read_prefix_entries(stream, errors=None):
+    # "cidr[,label]" lines (blank and # lines skipped); bad lines go to `errors` as (line number, text, message)
+    for n, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        cidr, _, label = line.partition(",")
+        cidr = cidr.strip()
+        try:
+            parse_network(cidr)
+        except ValueError as e:
+            if errors is None:
+                raise ValueError(f"line {n}: {e}")
+            errors.append((n, line, str(e)))
+            continue
+        yield cidr, label.strip()
+
+def lpm_steps(index, addresses, max_lines=STEP_LIMIT):
+    # tutor text for a few lookups: every network that contains the address, and which one wins
+    lines = [f"Index: {len(index)} networks → {index.intervals(4)} IPv4 + {index.intervals(6)} IPv6 intervals", ""]
+    matched = invalid = 0
+    first = None  # (address, [(network, label), ...] longest first) of the first match, for the tutor canvas
+    for k, text in enumerate(addresses):
+        # only the first max_lines addresses are explained (valid or not); the rest are just counted
+        shown = k < max_lines
+        try:
+            version, addr = parse_address(text)
+        except ValueError as e:
+            invalid += 1
+            if shown:
+                lines.append(f"{text}: {e}")
+            continue
+        hit = index.lookup_int(version, addr)
+        if hit is not None:
+            matched += 1
+        if not shown:
+            continue
+        if hit is None:
+            lines.append(f"{text} → no matching network")
+            continue
+        chain = index.covering(hit)
+        if first is None:
+            first = (text, [(index.network(i), index.labels[i]) for i in chain])
+        label = f" ({index.labels[hit]})" if index.labels[hit] else ""
+        lines.append(f"{text} → {index.network(hit)}{label}")
+        if len(chain) > 1:
+            lines.append("   also inside: " + ", ".join(index.network(i) for i in chain[1:]) + " — the longest prefix wins")
+        mask = PREFIX_TABLE[index.prefixes[hit]]["mask_int"] if version == 4 else IPV6_MASKS[index.prefixes[hit]]
+        lines.append(f"   check: {format_addr(addr, 32 if version == 4 else 128)} AND /{index.prefixes[hit]} mask = "
+                     f"{format_addr(addr & mask, 32 if version == 4 else 128)}")
+    if len(addresses) > max_lines:
+        lines.append(f"… {len(addresses) - max_lines} more addresses not shown")
+    lines.append("")
+    lines.append(f"Matched {matched} of {len(addresses)} addresses" + (f" ({invalid} invalid)" if invalid else ""))
+    return "\n".join(lines), {"matched": matched, "total": len(addresses), "networks": len(index), "first": first}
+
+@functools.lru_cache(maxsize=4)
+def _prefix_index_file(path, mtime, size):
+    # keyed on mtime/size so an edited file is re-read; repeat lookups against the same file reuse the index
+    # (the tutor runs these jobs on one dedicated worker process, so the cache lives as long as the window)
+    errors = []
+    with open(path, encoding="utf-8") as f:
+        return PrefixIndex(read_prefix_entries(f, errors)), len(errors)
+
+def lpm_lookup_steps(networks, addresses):
+    # networks: a "cidr[,label]" file path, or CIDRs separated by commas/spaces; addresses likewise separated
+    networks = networks.strip()
+    if os.path.isfile(networks):
+        st = os.stat(networks)
+        index, skipped = _prefix_index_file(os.path.abspath(networks), st.st_mtime, st.st_size)
+    else:
+        index, skipped = PrefixIndex(networks.replace(",", " ").split()), 0
+    if not len(index):
+        raise ValueError("No networks to search. Enter CIDRs (e.g. 10.0.0.0/8, 10.1.0.0/16) or choose a file.")
+    text, summary = lpm_steps(index, addresses.replace(",", " ").split())
+    if skipped:
+        text = f"({skipped} invalid network lines skipped)\n" + text
+    return text, summary
+
+# ---------- CIDR aggregation (route summarization) ----------
+# Collapse a prefix list into the fewest CIDRs covering exactly the same addresses: every prefix
+# becomes an integer range, one sort-and-merge sweep joins overlapping and adjacent ranges, and
+# each merged range is cut into the largest aligned blocks. No ipaddress objects on the way, and
+# the IPv4 merge is vectorized when numpy is installed, so a full routing table takes seconds.
+AGG_TRACE_LIMIT = 64   # inputs up to this size get the step-by-step trace
+
+def parse_prefixes(cidrs, errors=None):
+    # -> {4: (networks, prefixes), 6: (networks, prefixes)}; IPv4 as compact arrays, host bits not yet
+    # cleared. Bad entries raise, or go to `errors` as (text, message).
+    packed, prefixes4 = [], array("B")
+    nets6, prefixes6 = [], []
+    pton, af4 = socket.inet_pton, socket.AF_INET
+    lengths = _PREFIX_LENGTHS
+    for text in cidrs:
+        ip_text, _, prefix_text = text.partition("/")
+        prefix = lengths.get(prefix_text)
+        if prefix is not None:
+            # fast path for the common "a.b.c.d/nn" form
+            try:
+                packed.append(pton(af4, ip_text))
+                prefixes4.append(prefix)
+                continue
+            except OSError:
+                pass
+        try:
+            version, net, prefix = parse_network(text)
+        except ValueError as e:
+            if errors is None:
+                raise
+            errors.append((text, str(e)))
+            continue
+        if version == 4:
+            packed.append(net.to_bytes(4, "big"))
+            prefixes4.append(prefix)
+        else:
+            nets6.append(net)
+            prefixes6.append(prefix)
+    nets4 = array(_U32, b"".join(packed))
+    if sys.byteorder == "little":
+        nets4.byteswap()
+    return {4: (nets4, prefixes4), 6: (nets6, prefixes6)}
+
+def prefix_ranges(networks, prefixes, width=32):
+    # -> [(start, end), ...] inclusive, host bits cleared
+    return [(n >> (width - p) << (width - p), n | ((1 << (width - p)) - 1)) for n, p in zip(networks, prefixes)]
+
+def merge_ranges(ranges):
+    # sort by start, then one sweep: a range that starts at or before (end of the current block + 1) extends it
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(s, e) for s, e in merged]
+
+def range_to_cidrs(start, end, width=32):
+    # largest aligned power-of-two blocks, left to right -> [(network, prefix), ...]
+    out = []
+    while start <= end:
+        # alignment of start (trailing zero bits) and the size still left both cap the block
+        align = (start & -start).bit_length() - 1 if start else width
+        bits = min(align, (end - start + 1).bit_length() - 1)
+        out.append((start, width - bits))
+        start += 1 << bits
+    return out
+
+def aggregate_ipv4_vectorized(networks, prefixes):
+    # the same sweep in numpy: argsort, running max of the ends, and a new block wherever a range
+    # starts past everything seen so far (+1, so adjacent ranges join)
+    np = _numpy()
+    if not len(networks):
+        return []
+    nets = np.asarray(networks, dtype=np.int64)
+    size = np.left_shift(1, 32 - np.asarray(prefixes, dtype=np.int64))
+    starts = nets & -size
+    order = np.argsort(starts, kind="stable")
+    starts, reach = starts[order], np.maximum.accumulate((starts + size - 1)[order])
+    new = np.empty(len(starts), dtype=bool)
+    new[0] = True
+    new[1:] = starts[1:] > reach[:-1] + 1
+    starts, ends = starts[new], reach[np.append(np.flatnonzero(new)[1:] - 1, len(reach) - 1)]
+    # most merged ranges are already one aligned block; only the rest are cut in Python
+    size = ends - starts + 1
+    single = ((size & (size - 1)) == 0) & ((starts & (size - 1)) == 0)
+    nets, prefs = starts[single], 32 - np.log2(size[single]).astype(np.int64)
+    rest = [c for s, e in zip(starts[~single].tolist(), ends[~single].tolist()) for c in range_to_cidrs(s, e, 32)]
+    if rest:
+        cut = np.array(rest, dtype=np.int64)
+        nets, prefs = np.concatenate([nets, cut[:, 0]]), np.concatenate([prefs, cut[:, 1]])
+        order = np.argsort(nets, kind="stable")
+        nets, prefs = nets[order], prefs[order]
+    return list(zip(nets.tolist(), prefs.tolist()))
+
+def aggregate_family(networks, prefixes, width=32):
+    # one address family -> the minimal [(network, prefix), ...] covering exactly the same addresses
+    if width == 32 and NUMPY_AVAILABLE and len(networks) >= 1024:
+        return aggregate_ipv4_vectorized(networks, prefixes)
+    return [c for s, e in merge_ranges(prefix_ranges(networks, prefixes, width)) for c in range_to_cidrs(s, e, width)]
+
+def aggregate_prefixes(cidrs, errors=None):
+    # -> {4: [(network, prefix), ...], 6: [...]}
+    parsed = parse_prefixes(cidrs, errors)
+    return {4: aggregate_family(*parsed[4], 32), 6: aggregate_family(*parsed[6], 128)}
+
+def common_supernet(start, end, width=32):
+    # the single smallest prefix containing [start, end] (shared leading bits of the two ends)
+    prefix = width - (start ^ end).bit_length()
+    mask = ((1 << width) - 1) ^ ((1 << (width - prefix)) - 1)
+    return start & mask, prefix
+
+def _cidr_text(net, prefix, width):
+    return f"{format_addr(net, width)}/{prefix}"
+
+def aggregate_steps(cidrs, simple_mode=False):
+    # tutor text + result for a prefix list; the full trace only for small inputs
+    cidrs = [c.strip() for c in cidrs if c.strip()]
+    errors = []
+    parsed = parse_prefixes(cidrs, errors)
+    if not len(parsed[4][0]) and not parsed[6][0]:
+        if errors:
+            text, msg = errors[0]
+            raise ValueError(f"No valid prefixes to aggregate: all {len(errors)} entries are invalid (first: {text!r}: {msg})")
+        raise ValueError("No valid prefixes to aggregate. Enter CIDRs (e.g. 10.0.0.0/24, 10.0.1.0/24) or choose a file.")
+    result = {"input": len(cidrs), "invalid": len(errors), "errors": errors, "output": {4: [], 6: []}, "supernet": {}}
+    trace = len(cidrs) <= AGG_TRACE_LIMIT
+    lines = [f"Input: {len(cidrs)} prefixes"]
+    for text, msg in errors[:10]:
+        lines.append(f"  skipped {text}: {msg}")
+    if len(errors) > 10:
+        lines.append(f"  … {len(errors) - 10} more invalid lines skipped")
+    for version, width in ((4, 32), (6, 128)):
+        networks, prefixes = parsed[version]
+        if not len(networks):
+            continue
+        lines.append("")
+        if trace:
+            ranges = prefix_ranges(networks, prefixes, width)
+            merged = merge_ranges(ranges)
+            out = [c for s, e in merged for c in range_to_cidrs(s, e, width)]
+            lines.append(f"IPv{version}: {len(ranges)} prefixes → {len(merged)} merged ranges → {len(out)} CIDRs")
+            if simple_mode:
+                lines.append("Think of each prefix as a stretch of street numbers: sort them, glue stretches that")
+                lines.append("touch or overlap, then label each glued stretch with as few round-sized blocks as possible.")
+            lines.append("STEP 1 — Each prefix as an address range")
+            for (s, e), prefix in zip(ranges, prefixes):
+                lines.append(f"  • {_cidr_text(s, prefix, width)}: {format_addr(s, width)} – {format_addr(e, width)}")
+            lines.append("STEP 2 — Sort by start and sweep")
+            cur = None
+            for s, e in sorted(ranges):
+                span = f"{format_addr(s, width)} – {format_addr(e, width)}"
+                if cur is None or s > cur + 1:
+                    lines.append(f"  • {span}: " + ("first block" if cur is None else f"gap after {format_addr(cur, width)}, new block"))
+                    cur = e
+                    continue
+                if e <= cur:
+                    how = "inside the block, dropped"
+                else:
+                    how = "touches the block, joined" if s == cur + 1 else "overlaps, block extended"
+                    cur = e
+                lines.append(f"  • {span}: {how}")
+            lines.append("STEP 3 — Cut each block into the largest aligned CIDRs")
+            for s, e in merged:
+                lines.append(f"  • {format_addr(s, width)} – {format_addr(e, width)} ({e - s + 1} addresses)")
+                for net, prefix in range_to_cidrs(s, e, width):
+                    lines.append(f"      {_cidr_text(net, prefix, width)}  ({1 << (width - prefix)} addresses, start aligned to /{prefix})")
+        else:
+            out = aggregate_family(networks, prefixes, width)
+            lines.append(f"IPv{version}: {len(networks)} prefixes → {len(out)} CIDRs")
+        result["output"][version] = out
+        lines.append("Result:")
+        for net, prefix in out[:STEP_LIMIT]:
+            lines.append(f"  {_cidr_text(net, prefix, width)}")
+        if len(out) > STEP_LIMIT:
+            lines.append(f"  … {len(out) - STEP_LIMIT} more")
+        last, last_prefix = out[-1]
+        net, prefix = result["supernet"][version] = common_supernet(out[0][0], last + (1 << (width - last_prefix)) - 1, width)
+        extra = (1 << (width - prefix)) - sum(1 << (width - p) for _, p in out)
+        lines.append(f"Single supernet covering everything: {_cidr_text(net, prefix, width)}"
+                     + (f" (also covers {extra} addresses not in the input)" if extra else " (exact)"))
+    return "\n".join(lines), result
+
+def aggregate_source_steps(source, simple_mode=False):
+    # tutor entry point: a file path (one prefix per line) or CIDRs separated by commas/spaces
+    source = source.strip()
+    if os.path.isfile(source):
+        with open(source, encoding="utf-8") as f:
+            return aggregate_steps([line.partition(",")[0] for line in _read_cidrs(f)], simple_mode)
+    return aggregate_steps(source.replace(",", " ").split(), simple_mode)
+
+# ---------- Batch mode (headless, no Tk) ----------
+BATCH_FIELDS = ["cidr", "network", "prefix", "mask_dec", "broadcast", "first", "last", "total", "usable", "error"]
+
+def ipv4_batch_row(subnet_str):
+    # one output row with the same values the tutor shows in its viz summary
+    try:
+        ip_int, prefix = parse_ipv4_cidr(subnet_str)
+    except ValueError as e:
+        return [subnet_str, None, None, None, None, None, None, None, None, str(e)]
+    network, broadcast, first, last, total, usable = ipv4_subnet_ints(ip_int, prefix)
+    return [subnet_str, int_to_dotted(network), prefix, PREFIX_TABLE[prefix]["mask_dec"], int_to_dotted(broadcast),
+            int_to_dotted(first), int_to_dotted(last), total, usable, ""]
+
+_MASK_DEC = [row["mask_dec"] for row in PREFIX_TABLE]
+
+def _dotted_column(values):
+    # uint32 array -> dotted strings: the big-endian values viewed as 4-byte records, one inet_ntoa each
+    return list(map(socket.inet_ntoa, values.astype(">u4").view("V4").tolist()))
+
+def ipv4_batch_rows_vectorized(lines):
+    # ipv4_batch_row for a whole chunk: parsed into packed arrays, every field computed by
+    # ipv4_subnets_vectorized, and each column formatted in one pass
+    errors = {}
+    addrs, prefixes = cidrs_to_arrays(lines, errors)
+    v = ipv4_subnets_vectorized(addrs, prefixes)
+    prefix_list = prefixes.tolist()
+    rows = list(zip(lines, _dotted_column(v["network"]), prefix_list, [_MASK_DEC[p] for p in prefix_list],
+                                 _dotted_column(v["broadcast"]), _dotted_column(v["first"]), _dotted_column(v["last"]),
+                                 v["total"].tolist(), v["usable"].tolist(), itertools.repeat("")))
+    for i, msg in errors.items():
+        rows[i] = (lines[i], None, None, None, None, None, None, None, None, msg)
+    return rows
+
+def _batch_chunk(args):
+    # runs in a worker: formats a whole chunk so only one string crosses the process boundary
+    import csv
+    import json
+    lines, fmt = args
+    rows = ipv4_batch_rows_vectorized(lines) if NUMPY_AVAILABLE and lines else (ipv4_batch_row(l) for l in lines)
+    if fmt == "jsonl":
+        return "".join(json.dumps(dict(zip(BATCH_FIELDS, r))) + "\n" for r in rows)
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerows(rows)
+    return buf.getvalue()
+
+def _read_cidrs(stream):
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+def run_batch(in_stream, out_stream, fmt="csv", workers=None, chunk_size=10000):
+    # streams CIDRs in fixed-size chunks; at most 2 chunks per worker are in flight, so memory stays flat
+    import csv
+    cidrs = _read_cidrs(in_stream)
+    chunks = iter(lambda: list(itertools.islice(cidrs, chunk_size)), [])
+    if fmt == "csv":
+        csv.writer(out_stream, lineterminator="\n").writerow(BATCH_FIELDS)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks:
+            out_stream.write(_batch_chunk((chunk, fmt)))
+        return
+    import multiprocessing  # only batch runs pay for it
+    with multiprocessing.Pool(workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(_batch_chunk, ((chunk, fmt),)))
+            if len(pending) >= workers * 2:
+                out_stream.write(pending.popleft().get())
+        while pending:
+            out_stream.write(pending.popleft().get())
+
+def batch_main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(prog="main.py batch", description="Compute IPv4 subnet summaries for a list of CIDRs (one per line).")
+    parser.add_argument("input", nargs="?", default="-", help="input file (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("-f", "--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count, 1 = no pool)")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args(argv)
+    in_stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    out_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        run_batch(in_stream, out_stream, fmt=args.format, workers=args.workers, chunk_size=max(1, args.chunk_size))
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+        if out_stream is not sys.stdout:
+            out_stream.close()
+
+# ---------- Batch lookups ----------
+LOOKUP_FIELDS = ["address", "network", "label", "error"]
+
+def lookup_rows(index, addresses):
+    # one [address, network, label, error] row per input address. Addresses are parsed with inet_pton
+    # and searched per family in one call, so the per-address Python work is a parse and a row.
+    hits = [-1] * len(addresses)
+    errors = {}
+    pos4, packed4, pos6, ints6 = [], [], [], []
+    pton, af4, af6 = socket.inet_pton, socket.AF_INET, socket.AF_INET6
+    for i, a in enumerate(addresses):
+        try:
+            if ":" in a:
+                ints6.append(int.from_bytes(pton(af6, a), "big"))
+                pos6.append(i)
+            else:
+                packed4.append(pton(af4, a))
+                pos4.append(i)
+        except (OSError, ValueError):
+            errors[i] = f"Invalid IP address: {a!r}"
+    for positions, found in ((pos4, index.lookup_packed4(b"".join(packed4))), (pos6, index.lookup_ints(6, ints6))):
+        for i, h in zip(positions, found):
+            hits[i] = h
+    network, labels = index.network, index.labels
+    return [[a, network(h), labels[h], ""] if h >= 0 else [a, "", "", errors.get(i, "")]
+            for i, (a, h) in enumerate(zip(addresses, hits))]
+
+def run_lookup(index, in_stream, out_stream, fmt="csv", chunk_size=100000):
+    # streams addresses in chunks, so only the index (not the address list) has to fit in memory
+    import csv
+    import json
+    addresses = _read_cidrs(in_stream)
+    if fmt == "csv":
+        writer = csv.writer(out_stream, lineterminator="\n")
+        writer.writerow(LOOKUP_FIELDS)
+    for chunk in iter(lambda: list(itertools.islice(addresses, chunk_size)), []):
+        rows = lookup_rows(index, chunk)
+        if fmt == "jsonl":
+            out_stream.write("".join(json.dumps(dict(zip(LOOKUP_FIELDS, r))) + "\n" for r in rows))
+        else:
+            writer.writerows(rows)
+
+def lookup_main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(prog="main.py lookup", description="Longest-prefix match: find the most specific network for each address.")
+    parser.add_argument("networks", help="file of networks, one \"cidr[,label]\" per line (IPv4 and IPv6)")
+    parser.add_argument("input", nargs="?", default="-", help="addresses, one per line (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("-f", "--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--chunk-size", type=int, default=100000)
+    args = parser.parse_args(argv)
+    errors = []
+    with open(args.networks, encoding="utf-8") as f:
+        index = PrefixIndex(read_prefix_entries(f, errors))
+    for n, line, msg in errors[:10]:
+        print(f"{args.networks}:{n}: skipped {line!r}: {msg}", file=sys.stderr)
+    if len(errors) > 10:
+        print(f"{args.networks}: {len(errors) - 10} more invalid lines skipped", file=sys.stderr)
+    in_stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    out_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        run_lookup(index, in_stream, out_stream, fmt=args.format, chunk_size=max(1, args.chunk_size))
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+        if out_stream is not sys.stdout:
+            out_stream.close()
+
+def aggregate_main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(prog="main.py aggregate", description="Collapse a prefix list into the minimal set of CIDRs covering the same addresses.")
+    parser.add_argument("input", nargs="?", default="-", help="prefixes, one per line, IPv4 and IPv6 (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--trace", action="store_true", help=f"print the step-by-step explanation instead (inputs up to {AGG_TRACE_LIMIT} prefixes get the full trace)")
+    args = parser.parse_args(argv)
+    in_stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        cidrs = [line.partition(",")[0] for line in _read_cidrs(in_stream)]
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+    errors = []
+    if args.trace:
+        try:
+            text, result = aggregate_steps(cidrs)
+        except ValueError as e:
+            parser.error(str(e))
+        errors = result["errors"]
+        out = text + "\n"
+    else:
+        result = aggregate_prefixes(cidrs, errors)
+        out = "".join(f"{_cidr_text(net, prefix, w)}\n" for version, w in ((4, 32), (6, 128)) for net, prefix in result[version])
+        print(f"{len(cidrs)} prefixes → {sum(len(v) for v in result.values())}", file=sys.stderr)
+    for text, msg in errors[:10]:
+        print(f"skipped {text!r}: {msg}", file=sys.stderr)
+    if len(errors) > 10:
+        print(f"skipped {len(errors) - 10} more invalid lines", file=sys.stderr)
+    if args.output == "-":
+        sys.stdout.write(out)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out)
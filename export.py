@@ -0,0 +1,367 @@
+# export.py
+"""
+PDF export for the Visual Tutor. The GUI imports this on the first export, so reportlab and Pillow
+never count against startup time.
+"""
+
+import io
+import os
+import sys
+import csv
+import time
+import ipaddress
+import functools
+import multiprocessing
+from xml.sax.saxutils import escape
+
+from core import (METRICS, PREFIX_TABLE, HOST_COLORS, host_map_pixels, ipv4_host_spans, vlsm_host_spans, format_addr,
+                  ipv4_steps_verbose, ipv6_steps_verbose, hosts_to_ipv4_steps, vlsm_steps)
+
+# optional pillow for image embedding in PDF
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except Exception:
+    PIL_AVAILABLE = False
+
+# reportlab for PDF
+try:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, CondPageBreak, Flowable, Image as RLImage
+    from reportlab.lib.units import inch
+    from reportlab.lib import colors
+    REPORTLAB_AVAILABLE = True
+except Exception:
+    REPORTLAB_AVAILABLE = False
+
+# ---------- Tutor visuals as vector drawings ----------
+# The tutor's pictures rebuilt straight from its viz data as PDF vector ops: no Tk canvas, no
+# PostScript/Ghostscript round-trip, no image encoding, and it works headless. Coordinates below
+# are the tutor canvas's (top-left origin, pixels); _Sketch flips and scales them onto the page.
+# Strings stick to ASCII arrows: the base-14 PDF fonts have no glyph for "→".
+PDF_VISUAL_WIDTH = 6.5 * 72  # points; the text column of a letter page
+PDF_VISUAL_HEIGHT = 7.5 * 72  # leaves room for the title above it on the first page
+PDF_MAP_W, PDF_MAP_H = 256, 32  # host map grid in the PDF, coarser than on screen to keep the shape count low
+BIT_BOX, BIT_GAP = 24, 5
+OCTET_SPAN = (BIT_BOX + BIT_GAP) * 8 + 12
+HIGHLIGHT = "#f1c40f"
+
+@functools.lru_cache(maxsize=None)
+def _color(hex_color):
+    return colors.HexColor(hex_color)
+
+class _Sketch:
+    # records rects and text in canvas coordinates; drawing() turns them into a SketchFlowable
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+        self.ops = []
+
+    def rect(self, x0, y0, x1, y1, fill=None, outline=None, width=1):
+        self.ops.append(("rect", x0, self.height - y1, x1 - x0, y1 - y0, fill, outline, width))
+
+    def text(self, x, y, s, fill="#111111", size=10, mono=False, bold=False, anchor="nw"):
+        font = ("Courier" if mono else "Helvetica") + ("-Bold" if bold else "")
+        if anchor == "center":
+            self.ops.append(("ctext", x, self.height - y - size * 0.35, s, fill, font, size))
+        else:
+            self.ops.append(("text", x, self.height - y - size, s, fill, font, size))
+
+    def host_map(self, x, y, view_start, view_count, spans, w=PDF_MAP_W, h=PDF_MAP_H, cell=2, background=HOST_COLORS["free"]):
+        # one rectangle per run of equal pixels in a row, not per pixel
+        px = host_map_pixels(view_start, view_count, spans, w, h, background)
+        for r in range(h):
+            row = px[r*w:(r+1)*w]
+            c0 = 0
+            for c in range(1, w + 1):
+                if c == w or row[c] != row[c0]:
+                    self.rect(x + c0*cell, y + r*cell, x + c*cell, y + (r+1)*cell, fill=row[c0])
+                    c0 = c
+        self.rect(x, y, x + w*cell, y + h*cell, outline="#111111")
+
+    def drawing(self, page_width=PDF_VISUAL_WIDTH, page_height=PDF_VISUAL_HEIGHT):
+        # a flowable taller than the frame can't be placed at all, so tall plans shrink to fit too
+        return SketchFlowable(self.ops, self.width, self.height, min(1.0, page_width / self.width, page_height / self.height))
+
+class SketchFlowable(Flowable):
+    # replays the recorded ops straight onto the pdfgen canvas, changing colour/font state only when it
+    # differs; much cheaper than a graphics.shapes Drawing, whose nodes are validated and re-stated one by one
+    def __init__(self, ops, width, height, scale=1.0):
+        Flowable.__init__(self)
+        self.ops = ops
+        self.scale = scale
+        self.width, self.height = width * scale, height * scale
+
+    def wrap(self, avail_width, avail_height):
+        return self.width, self.height
+
+    def draw(self):
+        c = self.canv
+        c.saveState()
+        c.scale(self.scale, self.scale)
+        fill = stroke = line = font = None
+        for op in self.ops:
+            if op[0] == "rect":
+                _, x, y, w, h, f, s, width = op
+                if f and f != fill:
+                    c.setFillColor(_color(f))
+                    fill = f
+                if s and s != stroke:
+                    c.setStrokeColor(_color(s))
+                    stroke = s
+                if s and width != line:
+                    c.setLineWidth(width)
+                    line = width
+                c.rect(x, y, w, h, stroke=1 if s else 0, fill=1 if f else 0)
+            else:
+                kind, x, y, s, f, name, size = op
+                if f != fill:
+                    c.setFillColor(_color(f))
+                    fill = f
+                if (name, size) != font:
+                    c.setFont(name, size)
+                    font = (name, size)
+                if kind == "ctext":
+                    c.drawCentredString(x, y, s)
+                else:
+                    c.drawString(x, y, s)
+        c.restoreState()
+
+def _bit_row(sk, x, y, bits32, lit=0, outline_net=False):
+    for i, b in enumerate(bits32):
+        bx = x + (i // 8) * OCTET_SPAN + (i % 8) * (BIT_BOX + BIT_GAP)
+        if i < lit:
+            outline, width = HIGHLIGHT, 3
+        else:
+            outline, width = ("#145A32" if outline_net and b == '1' else "#222222"), 2
+        sk.rect(bx, y, bx + BIT_BOX, y + BIT_BOX, fill="#2ecc71" if b == '1' else "#e74c3c", outline=outline, width=width)
+        sk.text(bx + BIT_BOX/2, y + BIT_BOX/2, b, fill="#ffffff", size=9, mono=True, bold=True, anchor="center")
+
+def ipv4_drawing(viz, title=None):
+    # same layout as the tutor's final (static) frame, plus the host map underneath
+    x = 20
+    sk = _Sketch(x + OCTET_SPAN * 4, 560 + PDF_MAP_H * 3 + 8)
+    if title:
+        sk.text(x, 0, title, size=12, bold=True)
+    sk.text(x, 20, "Mask (binary):", size=10, bold=True)
+    _bit_row(sk, x, 40, "".join(viz['mask_bins']), lit=viz['prefix'], outline_net=True)
+    sk.text(x, 120, f"IP: {viz['ip_dec']}", size=10, bold=True)
+    _bit_row(sk, x, 140, "".join(viz['ip_bins']))
+    sk.text(x, 260, "Network Address (IP AND Mask):", size=10, bold=True)
+    sk.text(x, 278, f"IP bits : {'.'.join(viz['ip_bins'])}", size=10, mono=True)
+    sk.text(x, 296, f"Mask bits: {'.'.join(viz['mask_bins'])}", size=10, mono=True)
+    sk.text(x, 314, f"AND =>    {viz['network_bin']}", fill="#1e8449", size=10, mono=True, bold=True)
+    sk.text(x, 340, "Broadcast (host bits -> 1):", size=10, bold=True)
+    sk.text(x, 358, f"Host mask (inverse): {PREFIX_TABLE[viz['prefix']]['wildcard_bin']}", fill="#b9770e", size=10, mono=True)
+    sk.text(x, 376, f"OR => {viz['broadcast_bin']}", fill="#ba4a00", size=10, mono=True)
+    sk.text(x, 394, f"Broadcast address: {viz['broadcast']}", size=10, bold=True)
+    sk.rect(x, 420, x + 640, 540, fill="#2c3e50", outline="#111111")
+    lines = ["Summary:",
+             f"  Network: {viz['network']}/{viz['prefix']}",
+             f"  Netmask: {viz['mask_dec']}",
+             f"  Broadcast: {viz['broadcast']}",
+             f"  Total addresses: {viz['total']}",
+             f"  Usable hosts: {viz['usable']}",
+             f"  First usable: {viz['first']}",
+             f"  Last usable: {viz['last']}"]
+    for i, line in enumerate(lines):
+        sk.text(x + 8, 428 + 14*i, line, fill="#ecf0f1", size=10)
+    sk.host_map(x, 560, viz['network_int'], viz['total'],
+                ipv4_host_spans(viz['network_int'], viz['broadcast_int'], viz['prefix']), cell=3)
+    return sk.drawing()
+
+def ipv6_drawing(viz, title=None):
+    box_w, box_h, gap = 100, 26, 6
+    sk = _Sketch(18 + 8 * (box_w + gap), 110)
+    if title:
+        sk.text(18, 0, title, size=12, bold=True)
+    for i, g in enumerate(viz['groups']):
+        bx = 18 + i*(box_w+gap)
+        sk.rect(bx, 36, bx+box_w, 36+box_h, fill="#34495e", outline="#222222")
+        sk.text(bx+box_w/2, 36+box_h/2, g, fill="#ffffff", size=9, mono=True, anchor="center")
+    sk.text(18, 80, "Hextets: " + " ".join(viz['hextets']), size=10, mono=True)
+    return sk.drawing()
+
+def vlsm_drawing(plan, title=None, max_rows=40):
+    width = plan["width"]
+    base_net, base_prefix = plan["base"].split("/")
+    base_int = int(ipaddress.ip_address(base_net))
+    rows = plan["allocations"][:max_rows]
+    sk = _Sketch(18 + PDF_MAP_W * 2, 40 + PDF_MAP_H * 2 + 24 + 16 * (len(rows) + 3))
+    sk.text(18, 12, title or f"VLSM Plan inside {plan['base']}", size=12, bold=True)
+    sk.host_map(18, 40, base_int, 1 << (width - int(base_prefix)), vlsm_host_spans(plan))
+    sy = 40 + PDF_MAP_H * 2 + 16
+    for a in rows:
+        sk.text(18, sy, f"#{a['index']+1}: {a['hosts']} hosts -> {format_addr(a['network_int'], width)}/{a['prefix']}",
+                fill="#1e8449", size=10, mono=True)
+        sy += 16
+    if len(plan["allocations"]) > max_rows:
+        sk.text(18, sy, f"(+{len(plan['allocations']) - max_rows} more - see explanation)", size=9)
+        sy += 16
+    if plan["unplaced"]:
+        sk.text(18, sy, f"Did not fit: {len(plan['unplaced'])} request(s)", fill="#c0392b", size=10)
+        sy += 16
+    sk.text(18, sy, f"Free: {plan['free_addresses']} addresses in {len(plan['free'])} blocks", fill="#b9770e", size=10)
+    return sk.drawing()
+
+TUTOR_DRAWINGS = {"ipv4": ipv4_drawing, "ipv6": ipv6_drawing, "vlsm": vlsm_drawing}
+
+def tutor_drawing(kind, data, title=None):
+    # what the tutor last showed, as recorded by gui: ("ipv4", viz), ("ipv6", viz) or ("vlsm", plan)
+    if not REPORTLAB_AVAILABLE:
+        raise RuntimeError("Install reportlab to export PDFs: pip install reportlab")
+    return TUTOR_DRAWINGS[kind](data, title=title)
+
+# ---------- PDF export ----------
+def export_to_pdf(filename, title, explanation_text, canvas_image_bytes=None, drawing=None):
+    # drawing: a flowable from tutor_drawing; canvas_image_bytes: an already-encoded PNG/JPEG
+    if not REPORTLAB_AVAILABLE:
+        raise RuntimeError("Install reportlab to export PDFs: pip install reportlab")
+    doc = SimpleDocTemplate(filename, pagesize=letter)
+    styles = getSampleStyleSheet()
+    story = []
+    story.append(Paragraph(title, styles['Title']))
+    story.append(Spacer(1,12))
+    if drawing is not None:
+        story.append(drawing)
+        story.append(Spacer(1,12))
+    elif canvas_image_bytes and PIL_AVAILABLE:
+        # reportlab reads the encoded bytes itself; no decode/re-encode round-trip
+        try:
+            img = Image.open(io.BytesIO(canvas_image_bytes))
+            w, h = img.size
+            story.append(RLImage(io.BytesIO(canvas_image_bytes), width=6.5*inch, height=6.5*inch * h / w))
+            story.append(Spacer(1,12))
+        except Exception:
+            pass
+    story.extend(explanation_flowables(explanation_text, styles))
+    with METRICS.span("pdf.build"):
+        doc.build(story)
+
+def explanation_flowables(text, styles):
+    # one paragraph per line, blocks separated by blank lines; the text is escaped so "<" or "&" can't break the markup.
+    # Same look as a <br/>-joined paragraph per block, but reportlab re-wraps a paragraph every time it splits one
+    # across pages, which made a 5000-line VLSM block take minutes.
+    if 'ExplanationLine' not in styles:
+        styles.add(ParagraphStyle('ExplanationLine', parent=styles['BodyText'], spaceBefore=0))
+    for b in text.split('\n\n'):
+        for i, line in enumerate(b.split('\n')):
+            yield Paragraph(escape(line), styles['BodyText'] if i == 0 else styles['ExplanationLine'])
+        yield Spacer(1,8)
+
+# ---------- Bulk worksheets ----------
+# Many PDFs at once (one per student/site), built in a process pool. Each document's story is a
+# FlowableStream: reportlab pulls flowables from a generator as it lays out pages, so a worksheet
+# with hundreds of subnets never holds more than a few flowables at a time.
+WORKSHEET_LOOKAHEAD = 8
+
+class FlowableStream(list):
+    # build() only uses len(), [i], del [0] and inserts at the front; keep a few items buffered
+    def __init__(self, flowables, lookahead=WORKSHEET_LOOKAHEAD):
+        super().__init__()
+        self.source = iter(flowables)
+        self.lookahead = lookahead
+
+    def _fill(self):
+        while self.source is not None and list.__len__(self) < self.lookahead:
+            f = next(self.source, None)
+            if f is None:
+                self.source = None
+            else:
+                list.append(self, f)
+
+    def __len__(self):
+        self._fill()
+        return list.__len__(self)
+
+    def __getitem__(self, i):
+        self._fill()
+        return list.__getitem__(self, i)
+
+def worksheet_item_flowables(n, item, styles, simple_mode=False):
+    # item: "a.b.c.d/nn" or an IPv6 prefix (subnet -> hosts), a host count (hosts -> subnet),
+    # or "base h1 h2 ..." (VLSM plan)
+    parts = item.replace(",", " ").split()
+    yield Paragraph(escape(f"{n}. {item}"), styles['Heading2'])
+    try:
+        if len(parts) > 1:
+            text, plan = vlsm_steps(parts[0], parts[1:], simple_mode=simple_mode)
+            drawing = vlsm_drawing(plan)
+        elif parts[0].isdigit():
+            text, _ = hosts_to_ipv4_steps(parts[0], simple_mode=simple_mode)
+            drawing = None
+        elif ":" in parts[0]:
+            text, viz = ipv6_steps_verbose(parts[0], simple_mode=simple_mode)
+            drawing = ipv6_drawing(viz)
+        else:
+            text, viz = ipv4_steps_verbose(parts[0], simple_mode=simple_mode)
+            drawing = ipv4_drawing(viz)
+    except Exception as e:
+        yield Paragraph(escape(f"Error: {e}"), styles['BodyText'])
+        return
+    if drawing is not None:
+        yield drawing
+        yield Spacer(1,8)
+    yield from explanation_flowables(text, styles)
+    yield CondPageBreak(3*inch)
+
+def build_worksheet(job):
+    # runs in a worker: (filename, title, items, simple_mode) -> (filename, item count, seconds)
+    filename, title, items, simple_mode = job
+    t0 = time.perf_counter()
+    styles = getSampleStyleSheet()
+    def story():
+        yield Paragraph(escape(title), styles['Title'])
+        yield Spacer(1,12)
+        for n, item in enumerate(items, 1):
+            yield from worksheet_item_flowables(n, item, styles, simple_mode)
+    SimpleDocTemplate(filename, pagesize=letter, title=title).build(FlowableStream(story()))
+    return filename, len(items), time.perf_counter() - t0
+
+def read_worksheet_items(stream):
+    # CSV rows "worksheet,item"; returns [(name, [items...])] in first-seen order
+    groups = {}
+    for row in csv.reader(stream):
+        if not row or not row[0].strip() or row[0].lstrip().startswith("#"):
+            continue
+        if len(row) < 2 or not row[1].strip():
+            raise ValueError(f"Expected 'worksheet,item' but got: {','.join(row)}")
+        groups.setdefault(row[0].strip(), []).append(",".join(row[1:]).strip())
+    return list(groups.items())
+
+def _safe_filename(name):
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name) or "worksheet"
+
+def build_worksheets(groups, out_dir, workers=None, simple_mode=False):
+    # yields (filename, item count, seconds) as each PDF finishes
+    if not REPORTLAB_AVAILABLE:
+        raise RuntimeError("Install reportlab to export PDFs: pip install reportlab")
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(os.path.join(out_dir, _safe_filename(name) + ".pdf"), f"Subnetting Worksheet — {name}", items, simple_mode)
+            for name, items in groups]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) == 1:
+        yield from map(build_worksheet, jobs)
+        return
+    with multiprocessing.Pool(min(workers, len(jobs))) as pool:
+        yield from pool.imap_unordered(build_worksheet, jobs)
+
+def worksheets_main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(prog="main.py worksheets", description="Build one PDF worksheet per name from CSV rows 'worksheet,item'. "
+                                     "Items: a CIDR (IPv4/IPv6), a host count, or 'base h1 h2 ...' for a VLSM plan.")
+    parser.add_argument("input", nargs="?", default="-", help="CSV file (default: stdin)")
+    parser.add_argument("-o", "--out-dir", default="worksheets")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count, 1 = no pool)")
+    parser.add_argument("--simple", action="store_true", help="Simple English explanations")
+    args = parser.parse_args(argv)
+    in_stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+    try:
+        groups = read_worksheet_items(in_stream)
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+    t0 = time.perf_counter()
+    for done, (filename, count, secs) in enumerate(build_worksheets(groups, args.out_dir, args.workers, args.simple), 1):
+        print(f"[{done}/{len(groups)}] {filename} — {count} items, {secs:.1f}s", file=sys.stderr)
+    print(f"{len(groups)} worksheets in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
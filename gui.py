@@ -0,0 +1,1546 @@
+# gui.py
+"""
+Tk layer of the Visual Tutor: converter tabs, the subnetting tutor window and their drawing helpers.
+Imported by main.py only when the GUI starts; all math comes from core.
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog, font as tkfont
+import ttkbootstrap as tb
+import customtkinter as ctk
+import ipaddress
+import time
+import os
+import io
+import json
+import multiprocessing
+import functools
+import queue
+import threading
+import concurrent.futures
+
+from core import (
+    DIGITS36, PREFIX_TABLE, RESULT_CACHE, METRICS, LIVE_DEBOUNCE_MS, HornerValue, SubnetSequence, stream_lines, format_addr,
+    HOST_MAP_W, HOST_MAP_H, HOST_COLORS, host_map_pixels, ipv4_host_spans, vlsm_host_spans,
+    decimal_to_binary_lines, decimal_to_octal_lines, decimal_to_hex_lines,
+    binary_to_decimal_lines, octal_to_decimal_lines, hex_to_decimal_lines, base_to_base_tab_lines,
+    ipv4_steps_verbose, ipv6_steps_verbose, hosts_to_ipv4_steps, hosts_to_ipv6_steps, vlsm_steps, lpm_lookup_steps, aggregate_source_steps,
+)
+
+# ---------- Visual helpers ----------
+def draw_octet_bits(canvas, x, y, bits8, outline_net=False, tag=None):
+    box_w, box_h, gap = 24, 24, 5
+    with METRICS.span("draw.octet_bits"):
+        for i, b in enumerate(bits8):
+            bx = x + i*(box_w+gap)
+            color = "#2ecc71" if b == '1' else "#e74c3c"
+            outline = "#145A32" if outline_net and b == '1' else "#222"
+            tags = ()
+            if tag:
+                tags = (tag + f"_{i}",)
+            canvas.create_rectangle(bx, y, bx+box_w, y+box_h, fill=color, outline=outline, width=2, tags=tags)
+            canvas.create_text(bx+box_w/2, y+box_h/2, text=b, fill="white", font=("Consolas",9,"bold"), tags=tags)
+
+def draw_hextet_groups(canvas, x, y, groups):
+    box_w, box_h, gap = 100, 26, 6
+    for i, g in enumerate(groups):
+        bx = x + i*(box_w+gap)
+        canvas.create_rectangle(bx, y, bx+box_w, y+box_h, fill="#34495e", outline="#222")
+        canvas.create_text(bx+box_w/2, y+box_h/2, text=g, fill="white", font=("Consolas",9))
+
+def draw_subnet_page(canvas, x, y, seq, page=0, page_size=16):
+    # one page of a (possibly huge) SubnetSequence, with clickable Prev/Next
+    canvas.delete("subnet_page")
+    pages = max(1, -(-seq.count // page_size))
+    page = max(0, min(page, pages - 1))
+    tags = ("subnet_page",)
+    canvas.create_text(x, y, anchor="nw", text=f"Subnets /{seq.new_prefix} of {seq.base}: {seq.count} total — page {page+1} of {pages}",
+                       fill="#ecf0f1", font=("Segoe UI",10,"bold"), tags=tags)
+    row_y = y + 20
+    for i, net in enumerate(seq[page*page_size:(page+1)*page_size]):
+        canvas.create_text(x, row_y, anchor="nw", text=f"{page*page_size + i:>8}  {net.network_address}/{net.prefixlen}  →  {net.broadcast_address}",
+                           fill="#ecf0f1", font=("Consolas",10), tags=tags)
+        row_y += 16
+    nav_y = row_y + 6
+    for label, target, nx in (("◀ Prev", page - 1, x), ("Next ▶", page + 1, x + 80)):
+        enabled = 0 <= target < pages
+        item = canvas.create_text(nx, nav_y, anchor="nw", text=label, fill="#3498db" if enabled else "#7f8c8d",
+                                  font=("Segoe UI",10,"underline"), tags=tags)
+        if enabled:
+            canvas.tag_bind(item, "<Button-1>", lambda _e, t=target: draw_subnet_page(canvas, x, y, seq, t, page_size))
+
+# ---------- Raster host map ----------
+# One PhotoImage per map (pixels from core.host_map_pixels), so a /8 costs the same as a /30
+# and every zoom/pan is a single image.put() instead of thousands of items.
+HOST_MAP_MIN_VIEW = 4
+
+def host_map_data(px, width=HOST_MAP_W):
+    # PhotoImage.put() row format: "{c c c ...} {c c c ...}"
+    return " ".join("{" + " ".join(px[i:i+width]) + "}" for i in range(0, len(px), width))
+
+class HostMap:
+    # double-click zooms in 4x around the pointer, right-click zooms out, drag pans
+    def __init__(self, canvas, x, y, start, count, spans, width=HOST_MAP_W, height=HOST_MAP_H,
+                 addr_width=32, background=HOST_COLORS["free"]):
+        self.canvas = canvas
+        self.start, self.count = start, count
+        self.spans = spans
+        self.w, self.h = width, height
+        self.addr_width = addr_width
+        self.background = background
+        self.view_start, self.view_count = start, count
+        self.image = tk.PhotoImage(master=canvas, width=width, height=height)
+        self.item = canvas.create_image(x, y, anchor="nw", image=self.image)
+        canvas.create_rectangle(x-1, y-1, x+width, y+height, outline="#111")
+        self.label = canvas.create_text(x, y+height+4, anchor="nw", fill="#ecf0f1", font=("Consolas",9))
+        canvas.create_text(x, y+height+20, anchor="nw", fill="#95a5a6", font=("Segoe UI",8),
+                           text="Double-click: zoom in   Right-click: zoom out   Drag: pan")
+        self._drag = None
+        canvas.tag_bind(self.item, "<Double-Button-1>", lambda e: self.zoom(0.25, self._frac(e)))
+        canvas.tag_bind(self.item, "<Button-3>", lambda e: self.zoom(4, self._frac(e)))
+        canvas.tag_bind(self.item, "<ButtonPress-1>", self._press)
+        canvas.tag_bind(self.item, "<B1-Motion>", self._motion)
+        self.render()
+
+    def _frac(self, event):
+        x0, y0 = self.canvas.coords(self.item)
+        col = min(max(int(self.canvas.canvasx(event.x) - x0), 0), self.w - 1)
+        row = min(max(int(self.canvas.canvasy(event.y) - y0), 0), self.h - 1)
+        return (row * self.w + col) / (self.w * self.h)
+
+    def _press(self, event):
+        self._drag = (event.y, self.view_start)
+
+    def _motion(self, event):
+        if self._drag is None:
+            return
+        y0, start0 = self._drag
+        # one pixel row of vertical drag moves the view by one row's worth of addresses
+        shift = (y0 - event.y) * self.view_count // self.h
+        self._set_view(start0 + shift, self.view_count)
+
+    def zoom(self, factor, frac=0.5):
+        count = min(self.count, max(HOST_MAP_MIN_VIEW, int(self.view_count * factor)))
+        anchor = self.view_start + int(frac * self.view_count)
+        self._set_view(anchor - int(frac * count), count)
+
+    def pan(self, frac):
+        self._set_view(self.view_start + int(frac * self.view_count), self.view_count)
+
+    def _set_view(self, start, count):
+        start = min(max(start, self.start), self.start + self.count - count)
+        if (start, count) != (self.view_start, self.view_count):
+            self.view_start, self.view_count = start, count
+            self.render()
+
+    def render(self):
+        px = host_map_pixels(self.view_start, self.view_count, self.spans, self.w, self.h, self.background)
+        self.image.put(host_map_data(px, self.w))
+        per = self.view_count / (self.w * self.h)
+        per_text = f"{per:,.0f} addresses/pixel" if per >= 1 else f"{1/per:,.0f} pixels/address"
+        self.canvas.itemconfigure(self.label, text=f"{format_addr(self.view_start, self.addr_width)} – "
+                                  f"{format_addr(self.view_start + self.view_count - 1, self.addr_width)}   ({per_text})")
+
+# ---------- Retained IPv4 scene ----------
+BIT_BOX, BIT_GAP = 24, 5
+OCTET_SPAN = (BIT_BOX + BIT_GAP) * 8 + 12
+HIGHLIGHT = "#f1c40f"
+
+class BitRow:
+    # 32 bit cells (box + digit) created once; updates only reconfigure cells whose state changed
+    def __init__(self, canvas, x, y, tag):
+        self.canvas = canvas
+        self.cells = []
+        self.state = [None] * 32
+        self.lit = 0
+        for i in range(32):
+            bx = x + (i // 8) * OCTET_SPAN + (i % 8) * (BIT_BOX + BIT_GAP)
+            rect = canvas.create_rectangle(bx, y, bx+BIT_BOX, y+BIT_BOX, width=2, state="hidden",
+                                           tags=("retained", tag, f"{tag}_bit"))
+            text = canvas.create_text(bx+BIT_BOX/2, y+BIT_BOX/2, fill="white", font=("Consolas",9,"bold"),
+                                      state="hidden", tags=("retained", tag, f"{tag}_bit"))
+            self.cells.append((rect, text))
+        # one frame per octet for the octet-by-octet walk, shown rather than redrawn
+        self.octet_frames = [canvas.create_rectangle(x + k*OCTET_SPAN - 4, y-4, x + k*OCTET_SPAN + (BIT_BOX+BIT_GAP)*8 - 4, y+BIT_BOX+4,
+                                                     outline=HIGHLIGHT, width=3, state="hidden", tags=("retained", tag, f"{tag}_frame"))
+                             for k in range(4)]
+
+    def _outline(self, i):
+        b, net = self.state[i]
+        return (HIGHLIGHT, 3) if i < self.lit else ("#145A32" if net and b == '1' else "#222", 2)
+
+    def set_bits(self, bits32, outline_net=False):
+        # the retained replacement for draw_octet_bits, timed under the same kind of span
+        with METRICS.span("draw.bits"):
+            for i, b in enumerate(bits32):
+                new = (b, outline_net)
+                if self.state[i] == new:
+                    continue
+                self.state[i] = new
+                rect, text = self.cells[i]
+                color, width = self._outline(i)
+                self.canvas.itemconfigure(rect, fill="#2ecc71" if b == '1' else "#e74c3c", outline=color, width=width)
+                self.canvas.itemconfigure(text, text=b)
+
+    def light(self, n):
+        # yellow outline on the first n cells; only cells crossing the boundary are touched
+        n = max(0, min(32, n))
+        lo, hi = sorted((self.lit, n))
+        self.lit = n
+        for i in range(lo, hi):
+            color, width = self._outline(i)
+            self.canvas.itemconfigure(self.cells[i][0], outline=color, width=width)
+
+    def show_octet_frames(self, k):
+        for i, item in enumerate(self.octet_frames):
+            self.canvas.itemconfigure(item, state="normal" if i < k else "hidden")
+
+class IPv4Scene:
+    # every item the IPv4 tutor draws, built once per canvas and then only reconfigured
+    PAD_X = 20
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        x = self.PAD_X
+        t = lambda x, y, **kw: canvas.create_text(x, y, anchor="nw", state="hidden", tags=("retained", "ipv4"), **kw)
+        self.title = t(x, 0, fill="#ecf0f1", font=("Segoe UI",12,"bold"))
+        self.mask_label = t(x, 20, text="Mask (binary):", fill="#ecf0f1", font=("Segoe UI",10,"bold"))
+        self.mask = BitRow(canvas, x, 40, "mask")
+        self.ip_label = t(x, 120, fill="#ecf0f1", font=("Segoe UI",10,"bold"))
+        self.ip = BitRow(canvas, x, 140, "ip")
+        self.and_lines = [t(x, 260, text="Network Address (IP AND Mask):", fill="#ecf0f1", font=("Segoe UI",10,"bold")),
+                          t(x, 278, fill="#ecf0f1", font=("Consolas",10)),
+                          t(x, 296, fill="#ecf0f1", font=("Consolas",10)),
+                          t(x, 314, fill="#2ecc71", font=("Consolas",10,"bold"))]
+        self.bcast_lines = [t(x, 340, text="Broadcast (host bits → 1):", fill="#ecf0f1", font=("Segoe UI",10,"bold")),
+                            t(x, 358, fill="#f39c12", font=("Consolas",10)),
+                            t(x, 376, fill="#e67e22", font=("Consolas",10)),
+                            t(x, 394, fill="#ecf0f1", font=("Segoe UI",10,"bold"))]
+        self.summary_box = canvas.create_rectangle(x, 420, x+640, 540, fill="#2c3e50", outline="#111",
+                                                   state="hidden", tags=("retained", "ipv4", "summary"))
+        self.summary_lines = [t(x+8, 428 + 14*i, fill="#ecf0f1", font=("Segoe UI",10)) for i in range(8)]
+        self.anchor = self.title
+
+    @classmethod
+    def for_canvas(cls, canvas):
+        # rebuilt only if someone deleted the items (e.g. canvas.delete("all"))
+        scene = getattr(canvas, "_ipv4_scene", None)
+        if scene is None or not canvas.find_withtag(scene.anchor):
+            scene = canvas._ipv4_scene = cls(canvas)
+        return scene
+
+    def _show(self, item, text=None):
+        if text is None:
+            self.canvas.itemconfigure(item, state="normal")
+        else:
+            self.canvas.itemconfigure(item, text=text, state="normal")
+
+    def hide(self):
+        self.canvas.itemconfigure("ipv4", state="hidden")
+        self.canvas.itemconfigure("mask", state="hidden")
+        self.canvas.itemconfigure("ip", state="hidden")
+        self.mask.light(0)
+
+    def show_title(self, text):
+        self._show(self.title, text)
+
+    def show_mask(self, viz):
+        self._show(self.mask_label)
+        self.mask.set_bits("".join(viz['mask_bins']), outline_net=True)
+        self.canvas.itemconfigure("mask_bit", state="normal")
+
+    def show_ip(self, viz):
+        self._show(self.ip_label, f"IP: {viz['ip_dec']}")
+        self.ip.set_bits("".join(viz['ip_bins']))
+        self.canvas.itemconfigure("ip_bit", state="normal")
+
+    def show_and(self, viz):
+        texts = [None,
+                 f"IP bits : {'.'.join(viz['ip_bins'])}",
+                 f"Mask bits: {'.'.join(viz['mask_bins'])}",
+                 f"AND =>    {viz['network_bin']}"]
+        for item, text in zip(self.and_lines, texts):
+            self._show(item, text)
+
+    def show_broadcast(self, viz):
+        texts = [None,
+                 f"Host mask (inverse): {PREFIX_TABLE[viz['prefix']]['wildcard_bin']}",
+                 f"OR => {viz['broadcast_bin']}",
+                 f"Broadcast address: {viz['broadcast']}"]
+        for item, text in zip(self.bcast_lines, texts):
+            self._show(item, text)
+
+    def show_summary(self, viz):
+        self._show(self.summary_box)
+        texts = [
+            f"Summary:",
+            f"  Network: {viz['network']}/{viz['prefix']}",
+            f"  Netmask: {viz['mask_dec']}",
+            f"  Broadcast: {viz['broadcast']}",
+            f"  Total addresses: {viz['total']}",
+            f"  Usable hosts: {viz['usable']}",
+            f"  First usable: {viz['first']}",
+            f"  Last usable: {viz['last']}",
+        ]
+        for item, text in zip(self.summary_lines, texts):
+            self._show(item, text)
+
+    def show_all(self, viz):
+        # the final animation frame, drawn at once (static mode)
+        self.show_mask(viz)
+        self.mask.light(viz['prefix'])
+        self.show_ip(viz)
+        self.show_and(viz)
+        self.show_broadcast(viz)
+        self.show_summary(viz)
+
+# ---------- Timeline scheduler ----------
+FRAME_BUDGET_MS = 50   # a frame later than this lets the timeline skip droppable frames to catch up
+
+class Timeline:
+    # plays a list of (delay_ms, fn, droppable) frames and owns the only pending after() id,
+    # so cancel/pause/seek/speed changes can never leave a stray callback behind
+    def __init__(self, widget, frames, speed=1.0, budget_ms=FRAME_BUDGET_MS, on_reset=None):
+        self.widget = widget
+        self.frames = frames
+        self.speed = speed
+        self.budget_ms = budget_ms
+        self.on_reset = on_reset
+        self.pos = 0
+        self.paused = False
+        self.dropped = 0
+        self._after = None
+        self._due = 0.0
+
+    @property
+    def running(self):
+        return self._after is not None
+
+    @property
+    def finished(self):
+        return self.pos >= len(self.frames)
+
+    def _cancel_pending(self):
+        if self._after is not None:
+            try:
+                self.widget.after_cancel(self._after)
+            except Exception:
+                pass
+            self._after = None
+
+    def _schedule(self):
+        self._cancel_pending()
+        if self.finished:
+            return
+        delay = max(0, int(self.frames[self.pos][0] * self.speed))
+        self._due = time.perf_counter() + delay / 1000
+        self._after = self.widget.after(delay, self._tick)
+
+    def _tick(self):
+        self._after = None
+        late_ms = (time.perf_counter() - self._due) * 1000
+        METRICS.record("anim.late", max(0.0, late_ms) / 1000)
+        # behind budget: a droppable frame followed by another droppable one is overwritten anyway
+        if late_ms > self.budget_ms:
+            while self.pos + 1 < len(self.frames) and self.frames[self.pos][2] and self.frames[self.pos+1][2]:
+                self.pos += 1
+                self.dropped += 1
+                METRICS.count("anim.dropped")
+        with METRICS.span("anim.frame"):
+            self.frames[self.pos][1]()
+        self.pos += 1
+        if not self.paused:
+            self._schedule()
+
+    def play(self):
+        self.paused = False
+        self._schedule()
+
+    def pause(self):
+        self.paused = True
+        self._cancel_pending()
+
+    def resume(self):
+        if self.paused:
+            self.play()
+
+    def cancel(self):
+        self._cancel_pending()
+        self.pos = len(self.frames)
+
+    def seek(self, index):
+        # rebuild the state at `index` by applying the earlier frames immediately
+        self._cancel_pending()
+        index = max(0, min(index, len(self.frames)))
+        if self.on_reset:
+            self.on_reset()
+        for _, fn, _ in self.frames[:index]:
+            fn()
+        self.pos = index
+        if not self.paused:
+            self._schedule()
+
+    def set_speed(self, speed):
+        self.speed = speed
+        if self._after is not None:
+            self._schedule()
+
+# ---------- Animator (IPv4) ----------
+class IPv4Animator:
+    def __init__(self, canvas, viz, text_widget, speed_ms=700, title=None):
+        self.canvas = canvas
+        self.viz = viz
+        self.text = text_widget
+        self.speed_ms = speed_ms
+        self.title = title
+        self.scene = IPv4Scene.for_canvas(canvas)
+        self.timeline = Timeline(canvas, self._frames(), on_reset=self._blank)
+
+    @property
+    def running(self):
+        return self.timeline.running
+
+    def _frames(self):
+        # the whole animation as data; delays are for the speed the animator was built with
+        scene, viz, spd = self.scene, self.viz, self.speed_ms
+        prefix = viz['prefix']
+        frames = [(0, lambda: scene.show_mask(viz), False)]
+        # light the prefix bits a few at a time; each frame only touches the newly lit cells
+        n, delay = 1, 0
+        while True:
+            frames.append((delay, lambda k=min(n, prefix): scene.mask.light(k), True))
+            if n >= prefix:
+                break
+            n, delay = n + max(1, prefix//8), max(60, spd//8)
+        frames.append((spd//2, lambda: scene.show_ip(viz), False))
+        # highlight octet by octet
+        for k in range(4):
+            frames.append((0 if k == 0 else spd//3, lambda k=k: scene.ip.show_octet_frames(k+1), True))
+        frames.append((spd//3 * 2, lambda: scene.show_and(viz), False))
+        frames.append((spd//2, lambda: scene.show_broadcast(viz), False))
+        frames.append((spd//2, lambda: scene.show_summary(viz), False))
+        return frames
+
+    def _blank(self):
+        self.scene.hide()
+        if self.title:
+            self.scene.show_title(self.title)
+
+    def reset(self):
+        self.timeline.cancel()
+        self._blank()
+
+    def run(self):
+        self.timeline.cancel()
+        self.timeline.paused = False
+        self.timeline.seek(0)
+
+    def stop(self):
+        self.timeline.cancel()
+
+    def pause(self):
+        self.timeline.pause()
+
+    def resume(self):
+        self.timeline.resume()
+
+    def step(self, delta):
+        # move one frame while paused (seek replays up to the target frame)
+        self.timeline.pause()
+        self.timeline.seek(self.timeline.pos + delta)
+
+    def set_speed_ms(self, speed_ms):
+        self.timeline.set_speed(speed_ms / self.speed_ms)
+
+# ---------- Background jobs ----------
+# Work runs off the Tk thread: a thread pool for light jobs, a process pool (created on first use)
+# for bignum and bulk jobs. Worker threads never touch Tk; finished futures land in a queue that
+# the Tk thread drains from an after() poll. Each submit() supersedes the previous job on the same
+# channel (one channel per tab), so stale results are dropped instead of overwriting newer ones.
+JOB_POLL_MS = 15
+JOB_THREADS = 4
+HEAVY_INPUT_CHARS = 2000
+
+class JobRunner:
+    def __init__(self, widget, threads=JOB_THREADS, processes=None):
+        self.widget = widget
+        self.threads = concurrent.futures.ThreadPoolExecutor(threads, thread_name_prefix="job")
+        self.process_count = processes or max(1, (os.cpu_count() or 2) - 1)
+        self._processes = None
+        self._dedicated = {}  # name -> single-worker pool for heavy="<name>" jobs
+        self.done = queue.SimpleQueue()
+        self.generation = {}  # channel -> id of the newest job
+        self.futures = {}     # channel -> its running future
+        self.streams = {}     # channel -> (sink, stop event, on_lines) of a running stream job
+        self._manager = None
+        self._poll_job = None
+
+    @classmethod
+    def for_widget(cls, widget):
+        # one runner per Tk root, shared by the main window and the tutor
+        root = widget._root()
+        runner = getattr(root, "_job_runner", None)
+        if runner is None:
+            runner = root._job_runner = cls(root)
+            root.bind("<Destroy>", lambda e: runner.shutdown() if e.widget is root else None, add="+")
+        return runner
+
+    def processes(self, name=True):
+        # heavy=True jobs share one pool; heavy="<name>" jobs all run on one long-lived worker of their own,
+        # so module-level caches in that worker (e.g. an indexed network file) survive between jobs.
+        # spawn, not fork: forking a process that owns Tk and live threads is unsafe
+        if name is not True:
+            if name not in self._dedicated:
+                self._dedicated[name] = concurrent.futures.ProcessPoolExecutor(
+                    1, mp_context=multiprocessing.get_context("spawn"))
+            return self._dedicated[name]
+        if self._processes is None:
+            self._processes = concurrent.futures.ProcessPoolExecutor(
+                self.process_count, mp_context=multiprocessing.get_context("spawn"))
+        return self._processes
+
+    def manager(self):
+        # queues and events a process job can share with the Tk side (started on the first heavy stream)
+        if self._manager is None:
+            self._manager = multiprocessing.get_context("spawn").Manager()
+        return self._manager
+
+    def submit(self, channel, fn, *args, on_done, on_error=None, heavy=False):
+        gen = self.generation.get(channel, 0) + 1
+        self.generation[channel] = gen
+        old = self.futures.pop(channel, None)
+        if old is not None:
+            old.cancel()  # only stops jobs still queued; a running one finishes and is dropped
+        self._stop_stream(channel)
+        fut = (self.processes(heavy) if heavy else self.threads).submit(fn, *args)
+        METRICS.count("jobs.process" if heavy else "jobs.thread")
+        self.futures[channel] = fut
+        fut.add_done_callback(lambda f: self.done.put((channel, gen, f, on_done, on_error)))
+        if self._poll_job is None:
+            self._poll_job = self.widget.after(JOB_POLL_MS, self._poll)
+        return fut
+
+    def stream(self, channel, fn, *args, on_lines, on_done, on_error=None, heavy=False):
+        # like submit, for a *_lines converter: batches of lines reach on_lines(batch) on the Tk thread
+        # while it runs, then on_done(line count). Cancelling stops the worker at its next batch.
+        if heavy:
+            sink, stop = self.manager().Queue(), self.manager().Event()
+        else:
+            sink, stop = queue.SimpleQueue(), threading.Event()
+        fut = self.submit(channel, stream_lines, sink, stop, fn, *args, on_done=on_done, on_error=on_error, heavy=heavy)
+        self.streams[channel] = (sink, stop, on_lines)
+        return fut
+
+    def _stop_stream(self, channel):
+        stream = self.streams.pop(channel, None)
+        if stream is not None:
+            stream[1].set()
+
+    def _drain(self, sink, on_lines):
+        while True:
+            try:
+                batch = sink.get_nowait()
+            except queue.Empty:
+                return
+            on_lines(batch)
+
+    def cancel(self, channel):
+        self.generation[channel] = self.generation.get(channel, 0) + 1
+        fut = self.futures.pop(channel, None)
+        if fut is not None:
+            fut.cancel()
+        self._stop_stream(channel)
+
+    def busy(self, channel):
+        return channel in self.futures
+
+    def _poll(self):
+        self._poll_job = None
+        for sink, _, on_lines in list(self.streams.values()):
+            self._drain(sink, on_lines)
+        while True:
+            try:
+                channel, gen, fut, on_done, on_error = self.done.get_nowait()
+            except queue.Empty:
+                break
+            if gen != self.generation.get(channel) or fut.cancelled():
+                METRICS.count("jobs.dropped")
+                continue  # superseded or cancelled
+            self.futures.pop(channel, None)
+            stream = self.streams.pop(channel, None)
+            if stream is not None:
+                self._drain(stream[0], stream[2])  # the batches put after the last poll
+            try:
+                result = fut.result()
+            except Exception as e:
+                METRICS.count("jobs.failed")
+                if on_error is not None:
+                    on_error(e)
+                continue
+            on_done(result)
+        if self.futures:
+            self._poll_job = self.widget.after(JOB_POLL_MS, self._poll)
+
+    def shutdown(self):
+        self.generation.clear()
+        self.futures.clear()
+        for channel in list(self.streams):
+            self._stop_stream(channel)
+        self.threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+        for pool in self._dedicated.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        if self._manager is not None:
+            self._manager.shutdown()
+
+# ---------- Virtualized line view ----------
+# The Text widget only ever holds the lines that fit on screen; the full output lives in a plain
+# list, so scrolling, jump-to-line and search cost the same at 100 lines or 10 million.
+class LineView:
+    def __init__(self, master, font=("Consolas",11), wrap="word"):
+        self.lines = []
+        self.top = 0
+        self.match = None  # (line index, column, length) of the current search hit
+        self.frame = ttk.Frame(master)
+        self.frame.grid_rowconfigure(0, weight=1)
+        self.frame.grid_columnconfigure(0, weight=1)
+        self.text = tk.Text(self.frame, wrap=wrap, font=font, state="disabled")
+        self.text.grid(row=0, column=0, sticky="nsew")
+        self.text.tag_configure("match", background="#f1c40f", foreground="#111")
+        self.scroll = ttk.Scrollbar(self.frame, orient="vertical", command=self.yview)
+        self.scroll.grid(row=0, column=1, sticky="ns")
+        self.linespace = max(1, tkfont.Font(font=font).metrics("linespace"))
+        bar = ttk.Frame(self.frame)
+        bar.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(4,0))
+        bar.grid_columnconfigure(3, weight=1)
+        ttk.Label(bar, text="Line:").grid(row=0, column=0, padx=(0,4))
+        self.line_entry = ttk.Entry(bar, width=8)
+        self.line_entry.grid(row=0, column=1)
+        ttk.Button(bar, text="Go", command=self._goto_entry).grid(row=0, column=2, padx=(4,12))
+        self.find_entry = ttk.Entry(bar)
+        self.find_entry.grid(row=0, column=3, sticky="ew")
+        ttk.Button(bar, text="Find Next", command=lambda: self._find_entry(True)).grid(row=0, column=4, padx=(4,0))
+        ttk.Button(bar, text="Prev", command=lambda: self._find_entry(False)).grid(row=0, column=5, padx=(4,0))
+        self.pos_label = ttk.Label(bar, text="", width=22, anchor="e")
+        self.pos_label.grid(row=0, column=6, padx=(8,0))
+        self.line_entry.bind("<Return>", lambda e: self._goto_entry())
+        self.find_entry.bind("<Return>", lambda e: self._find_entry(True))
+        self.find_entry.bind("<Shift-Return>", lambda e: self._find_entry(False))
+        self.text.bind("<Configure>", lambda e: self._render())
+        self.text.bind("<MouseWheel>", lambda e: self._wheel(-1 if e.delta > 0 else 1))
+        self.text.bind("<Button-4>", lambda e: self._wheel(-1))
+        self.text.bind("<Button-5>", lambda e: self._wheel(1))
+        for key, fn in (("<Up>", lambda: self.scroll_lines(-1)), ("<Down>", lambda: self.scroll_lines(1)),
+                        ("<Prior>", lambda: self.scroll_lines(-self.rows())), ("<Next>", lambda: self.scroll_lines(self.rows())),
+                        ("<Control-Home>", lambda: self.goto(1)), ("<Control-End>", lambda: self.goto(len(self.lines)))):
+            self.text.bind(key, lambda e, fn=fn: (fn(), "break")[1])
+        self.text.bind("<Button-1>", lambda e: self.text.focus_set())
+
+    def grid(self, **kw):
+        self.frame.grid(**kw)
+
+    def rows(self):
+        return max(1, self.text.winfo_height() // self.linespace)
+
+    # ----- content -----
+    def set_text(self, s):
+        self.set_lines(s.split("\n") if s else [])
+
+    def set_lines(self, lines):
+        with METRICS.span("view.set_lines"):
+            self.lines = list(lines)
+            self.top = 0
+            self.match = None
+            self._render()
+
+    def append(self, lines):
+        old = len(self.lines)
+        self.lines.extend(lines)
+        # only redraw when the new lines land inside the visible window
+        if old < self.top + self.rows() + 1:
+            self._render()
+        else:
+            self._update_scrollbar()
+
+    def clear(self):
+        self.set_lines([])
+
+    def get(self):
+        return "\n".join(self.lines)
+
+    # ----- navigation -----
+    def scroll_lines(self, n):
+        self._set_top(self.top + n)
+
+    def _wheel(self, direction):
+        self.scroll_lines(3 * direction)
+        return "break"
+
+    def yview(self, *args):
+        # scrollbar protocol: ("moveto", fraction) or ("scroll", n, "units"|"pages")
+        if args[0] == "moveto":
+            self._set_top(int(float(args[1]) * len(self.lines)))
+        elif args[0] == "scroll":
+            n = int(args[1])
+            self.scroll_lines(n * self.rows() if args[2] == "pages" else n)
+
+    def goto(self, lineno):
+        # 1-based, like the Line: box
+        self._set_top(lineno - 1 - self.rows() // 3)
+        self.pos_label.config(text=f"Line {min(max(lineno, 1), len(self.lines))} of {len(self.lines)}")
+
+    def find(self, needle, forward=True):
+        # case-insensitive substring search starting after the current hit; wraps around
+        if not needle or not self.lines:
+            return None
+        needle = needle.lower()
+        n = len(self.lines)
+        start = self.match[0] if self.match else (self.top - 1 if forward else self.top)
+        step = 1 if forward else -1
+        for k in range(1, n + 1):
+            i = (start + step * k) % n
+            col = self.lines[i].lower().find(needle)
+            if col >= 0:
+                self.match = (i, col, len(needle))
+                self.goto(i + 1)
+                return i + 1
+        self.match = None
+        self._render()
+        self.pos_label.config(text="No match")
+        return None
+
+    def _goto_entry(self):
+        try:
+            self.goto(int(self.line_entry.get().strip()))
+        except ValueError:
+            self.pos_label.config(text="Enter a line number")
+
+    def _find_entry(self, forward):
+        self.find(self.find_entry.get(), forward)
+        return "break"
+
+    # ----- drawing -----
+    def _set_top(self, top):
+        top = min(max(top, 0), max(0, len(self.lines) - self.rows()))
+        self.top = top
+        self._render()
+
+    def _render(self):
+        rows = self.rows()
+        window = self.lines[self.top:self.top + rows + 1]
+        t = self.text
+        t.config(state="normal")
+        t.delete("1.0", tk.END)
+        t.insert("1.0", "\n".join(window))
+        if self.match and self.top <= self.match[0] < self.top + len(window):
+            i, col, length = self.match
+            row = i - self.top + 1
+            t.tag_add("match", f"{row}.{col}", f"{row}.{col + length}")
+        if self.top + rows >= len(self.lines):
+            t.yview_moveto(1.0)  # wrapped lines can overflow the window; keep the real tail reachable
+        t.config(state="disabled")
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        n = len(self.lines)
+        if n == 0:
+            self.scroll.set(0, 1)
+        else:
+            self.scroll.set(self.top / n, min(1.0, (self.top + self.rows()) / n))
+
+# ---------- Tutor window (grid-based responsive layout) ----------
+def open_tutor_window(parent, simple_mode_var):
+    win = tb.Toplevel()
+    win.title("Subnetting Visual Tutor — UX")
+    win.minsize(1100, 780)
+    win.geometry("1200x820")
+    try:
+        win.eval('tk::PlaceWindow %s center' % win.winfo_toplevel())
+    except Exception:
+        pass
+
+    # Configure grid: row0 = input (fixed), row1 = content (expands), row2 = bottom controls (fixed)
+    win.grid_rowconfigure(0, weight=0)
+    win.grid_rowconfigure(1, weight=1)
+    win.grid_rowconfigure(2, weight=0)
+    win.grid_columnconfigure(0, weight=1)
+
+    # Input frame (row 0)
+    input_frame = ttk.Frame(win, padding=8)
+    input_frame.grid(row=0, column=0, sticky="ew")
+    for c in range(4):
+        input_frame.grid_columnconfigure(c, weight=1)
+    ttk.Label(input_frame, text="Mode:").grid(row=0, column=0, sticky="w")
+    mode_var = tk.StringVar(value="subnet_to_hosts")
+    rb1 = ttk.Radiobutton(input_frame, text="Subnet → Hosts", variable=mode_var, value="subnet_to_hosts")
+    rb2 = ttk.Radiobutton(input_frame, text="Hosts → Subnet", variable=mode_var, value="hosts_to_subnet")
+    rb3 = ttk.Radiobutton(input_frame, text="VLSM Plan", variable=mode_var, value="vlsm")
+    rb4 = ttk.Radiobutton(input_frame, text="Lookup (Longest Match)", variable=mode_var, value="lookup")
+    rb1.grid(row=0, column=1, sticky="w")
+    rb2.grid(row=0, column=2, sticky="w")
+    rb3.grid(row=0, column=3, sticky="w")
+    rb5 = ttk.Radiobutton(input_frame, text="Aggregate (Summarize)", variable=mode_var, value="aggregate")
+    rb4.grid(row=0, column=4, sticky="w")
+    rb5.grid(row=0, column=5, sticky="w")
+    version_var = tk.IntVar(value=4)
+    ttk.Radiobutton(input_frame, text="IPv4", variable=version_var, value=4).grid(row=0, column=6, sticky="e")
+    ttk.Radiobutton(input_frame, text="IPv6", variable=version_var, value=6).grid(row=0, column=7, sticky="e")
+    # inputs
+    lbl_subnet = ttk.Label(input_frame, text="Subnet (e.g. 172.54.1.0/26):")
+    entry_subnet = ttk.Entry(input_frame)
+    lbl_hosts = ttk.Label(input_frame, text="Hosts (e.g. 50):")
+    entry_hosts = ttk.Entry(input_frame)
+    lbl_base = ttk.Label(input_frame, text="Optional base network:")
+    entry_base = ttk.Entry(input_frame)
+    lbl_vlsm = ttk.Label(input_frame, text="Host counts (e.g. 50,20,10):")
+    entry_vlsm = ttk.Entry(input_frame)
+    lbl_nets = ttk.Label(input_frame, text="Networks (CIDRs or a file):")
+    entry_nets = ttk.Entry(input_frame)
+    lbl_addrs = ttk.Label(input_frame, text="Addresses (e.g. 10.1.2.3, 2001:db8::1):")
+    entry_addrs = ttk.Entry(input_frame)
+
+    def browse_networks():
+        path = filedialog.askopenfilename(filetypes=[("Network lists","*.txt *.csv"), ("All files","*")])
+        if path:
+            entry_nets.delete(0, tk.END)
+            entry_nets.insert(0, path)
+    nets_btn = ttk.Button(input_frame, text="Browse…", command=browse_networks)
+
+    def place_inputs(*_):
+        # clear
+        for w in (lbl_subnet, entry_subnet, lbl_hosts, entry_hosts, lbl_base, entry_base, lbl_vlsm, entry_vlsm,
+                  lbl_nets, entry_nets, nets_btn, lbl_addrs, entry_addrs):
+            try:
+                w.grid_forget()
+            except Exception:
+                pass
+        if mode_var.get() == "subnet_to_hosts":
+            lbl_subnet.grid(row=1, column=0, sticky="w", pady=(6,0))
+            entry_subnet.grid(row=1, column=1, columnspan=3, sticky="ew", pady=(6,0))
+        elif mode_var.get() == "vlsm":
+            lbl_base.configure(text="Base network:")
+            lbl_vlsm.grid(row=1, column=0, sticky="w", pady=(6,0))
+            entry_vlsm.grid(row=1, column=1, sticky="ew", pady=(6,0))
+            lbl_base.grid(row=1, column=2, sticky="w", pady=(6,0))
+            entry_base.grid(row=1, column=3, sticky="ew", pady=(6,0))
+        elif mode_var.get() == "lookup":
+            lbl_nets.configure(text="Networks (CIDRs or a file):")
+            lbl_nets.grid(row=1, column=0, sticky="w", pady=(6,0))
+            entry_nets.grid(row=1, column=1, columnspan=2, sticky="ew", pady=(6,0))
+            nets_btn.grid(row=1, column=3, sticky="w", padx=(6,0), pady=(6,0))
+            lbl_addrs.grid(row=2, column=0, sticky="w", pady=(6,0))
+            entry_addrs.grid(row=2, column=1, columnspan=3, sticky="ew", pady=(6,0))
+        elif mode_var.get() == "aggregate":
+            lbl_nets.configure(text="Prefixes (CIDRs or a file):")
+            lbl_nets.grid(row=1, column=0, sticky="w", pady=(6,0))
+            entry_nets.grid(row=1, column=1, columnspan=2, sticky="ew", pady=(6,0))
+            nets_btn.grid(row=1, column=3, sticky="w", padx=(6,0), pady=(6,0))
+        else:
+            lbl_base.configure(text="Optional base network:")
+            lbl_hosts.grid(row=1, column=0, sticky="w", pady=(6,0))
+            entry_hosts.grid(row=1, column=1, sticky="w", pady=(6,0))
+            lbl_base.grid(row=1, column=2, sticky="w", pady=(6,0))
+            entry_base.grid(row=1, column=3, sticky="ew", pady=(6,0))
+    mode_var.trace_add("write", place_inputs)
+    place_inputs()
+
+    # Content (row 1) : Paned window (left canvas, right text)
+    paned = ttk.PanedWindow(win, orient=tk.HORIZONTAL)
+    paned.grid(row=1, column=0, sticky="nsew", padx=8, pady=8)
+    left = ttk.Frame(paned)
+    right = ttk.Frame(paned, width=420)
+    paned.add(left, weight=3)
+    paned.add(right, weight=1)
+
+    # Canvas in left, with vertical scrollbar
+    left.grid_rowconfigure(0, weight=1)
+    left.grid_columnconfigure(0, weight=1)
+    canvas_frame = ttk.Frame(left)
+    canvas_frame.grid(row=0, column=0, sticky="nsew")
+    canvas = tk.Canvas(canvas_frame, bg="#1e1e1e")
+    canvas.grid(row=0, column=0, sticky="nsew")
+    vscroll = ttk.Scrollbar(canvas_frame, orient="vertical", command=canvas.yview)
+    vscroll.grid(row=0, column=1, sticky="ns")
+    canvas.configure(yscrollcommand=vscroll.set)
+
+    # text explanation in right with scrollbar
+    right.grid_rowconfigure(0, weight=1)
+    right.grid_columnconfigure(0, weight=1)
+    explanation = LineView(right, font=("Segoe UI",10))
+    explanation.grid(row=0, column=0, sticky="nsew", padx=(6,0))
+
+    # Bottom controls (row 2) anchored and always visible
+    bottom = ttk.Frame(win, padding=8)
+    bottom.grid(row=2, column=0, sticky="ew")
+    bottom.grid_columnconfigure(0, weight=1)
+    # left aligned buttons
+    left_controls = ttk.Frame(bottom)
+    left_controls.grid(row=0, column=0, sticky="w")
+    run_btn = ttk.Button(left_controls, text="Show Steps (Visualize)")
+    run_btn.grid(row=0, column=0, padx=6)
+    static_btn = ttk.Button(left_controls, text="Show Static (No Animation)")
+    static_btn.grid(row=0, column=1, padx=6)
+    replay_btn = ttk.Button(left_controls, text="Replay")
+    replay_btn.grid(row=0, column=2, padx=6)
+    pause_btn = ttk.Button(left_controls, text="Pause", width=8)
+    pause_btn.grid(row=0, column=3, padx=6)
+    back_btn = ttk.Button(left_controls, text="◀", width=3)
+    back_btn.grid(row=0, column=4, padx=(6,0))
+    fwd_btn = ttk.Button(left_controls, text="▶", width=3)
+    fwd_btn.grid(row=0, column=5, padx=(2,6))
+    # right aligned controls
+    right_controls = ttk.Frame(bottom)
+    right_controls.grid(row=0, column=1, sticky="e")
+    speed_label = ttk.Label(right_controls, text="Speed:")
+    speed_label.grid(row=0, column=0, padx=(0,6))
+    speed_combo = ttk.Combobox(right_controls, values=["slow","normal","fast"], state="readonly", width=8)
+    speed_combo.set("normal")
+    speed_combo.grid(row=0, column=1, padx=(0,10))
+    # Simple English toggle (customtkinter switch)
+    try:
+        simple_switch = ctk.CTkSwitch(master=right_controls, text="Simple English", command=lambda: simple_mode_var.set(0 if simple_mode_var.get() else 1))
+        if simple_mode_var.get():
+            simple_switch.select()
+        else:
+            simple_switch.deselect()
+        simple_switch.grid(row=0, column=2, padx=(0,12))
+    except Exception:
+        ttk.Checkbutton(right_controls, text="Simple English", variable=simple_mode_var).grid(row=0, column=2, padx=(0,12))
+    export_btn = ttk.Button(right_controls, text="Export PDF")
+    export_btn.grid(row=0, column=3, padx=(0,6))
+
+    # animator holder
+    animator = {"obj": None}
+    runner = JobRunner.for_widget(win)
+    channel = ("tutor", str(win))
+    win.bind("<Destroy>", lambda e: runner.cancel(channel) if e.widget is win else None, add="+")
+    host_maps = []  # keeps each map's PhotoImage alive while its canvas item exists
+    visual = {"last": None}  # (kind, data, title) of the current picture, redrawn by export.tutor_drawing
+
+    # helper: clear canvas & explanation
+    def clear_all():
+        # cancel the previous job and animation so re-runs never stack timelines on the same canvas
+        runner.cancel(channel)
+        if animator["obj"] is not None:
+            animator["obj"].stop()
+            animator["obj"] = None
+        pause_btn.config(text="Pause")
+        # the IPv4 scene's items are reused across runs (just hidden); everything else is dropped
+        canvas.delete("!retained")
+        host_maps.clear()
+        visual["last"] = None
+        IPv4Scene.for_canvas(canvas).hide()
+        explanation.clear()
+        canvas.configure(scrollregion=(0,0,0,0))
+
+    # function to adjust canvas scroll region after drawings
+    def update_canvas_region():
+        canvas.update_idletasks()
+        bbox = canvas.bbox("all")
+        if bbox:
+            canvas.configure(scrollregion=bbox)
+
+    # computation runs on the shared JobRunner; draw() gets the result back on the Tk thread,
+    # and a newer run (or clear_all) supersedes a job that is still in flight
+    def run_job(compute, draw, heavy=False):
+        submitted = time.perf_counter()
+        def done(result):
+            METRICS.record("tutor.job", time.perf_counter() - submitted)  # submit -> result back on the Tk thread
+            try:
+                with METRICS.span("tutor.draw"):
+                    draw(result)
+                METRICS.gauge("tutor.canvas_items", len(canvas.find_all()))
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+        def timed(compute=compute):
+            with METRICS.span("tutor.compute"):
+                return compute()
+        if PROFILE["armed"]:
+            # the armed run is profiled end to end on the Tk thread (a worker thread would be invisible to cProfile)
+            PROFILE["armed"] = False
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                done(timed())
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+            finally:
+                profiler.disable()
+                PROFILE["profile"] = profiler
+            return
+        # process jobs can't pickle the timing wrapper; their time shows up in tutor.job only
+        runner.submit(channel, compute if heavy else timed, on_done=done,
+                      on_error=lambda e: messagebox.showerror("Error", str(e)), heavy=heavy)
+
+    # function to show subnet steps (animated or static)
+    def show_steps(animated=True):
+        clear_all()
+        simple = bool(simple_mode_var.get())
+        spd = {'slow':1200,'normal':700,'fast':300}[speed_combo.get()]
+        if mode_var.get() == "subnet_to_hosts":
+            subnet = entry_subnet.get().strip()
+            if not subnet:
+                messagebox.showerror("Input required", "Please enter a subnet (e.g. 172.54.1.0/26).")
+                return
+            if version_var.get() == 4:
+                def draw(result):
+                    text, viz = result
+                    explanation.set_text(text)
+                    update_canvas_region()
+                    if animated:
+                        anim = IPv4Animator(canvas, viz, explanation, speed_ms=spd, title=f"Subnet: {subnet}")
+                        animator['obj'] = anim
+                        anim.run()
+                    else:
+                        # static draw: the animation's final frame, on the same retained items
+                        scene = IPv4Scene.for_canvas(canvas)
+                        scene.show_title(f"Subnet: {subnet}")
+                        scene.show_all(viz)
+                    host_maps.append(HostMap(canvas, IPv4Scene.PAD_X, 560, viz['network_int'], viz['total'],
+                                             ipv4_host_spans(viz['network_int'], viz['broadcast_int'], viz['prefix'])))
+                    visual["last"] = ("ipv4", viz, f"Subnet: {subnet}")
+                    update_canvas_region()
+                run_job(functools.partial(ipv4_steps_verbose, subnet, simple_mode=simple), draw)
+            else:
+                # IPv6 static
+                def draw(result):
+                    text, viz = result
+                    explanation.set_text(text)
+                    canvas.create_text(18,12, anchor="nw", text=f"IPv6: {subnet}", fill="#ecf0f1", font=("Segoe UI",12,"bold"))
+                    draw_hextet_groups(canvas, 18, 48, viz['groups'])
+                    canvas.create_text(18, 220, anchor="nw", text="Hextets: " + " ".join(viz['hextets']), fill="#ecf0f1", font=("Consolas",10))
+                    visual["last"] = ("ipv6", viz, f"IPv6: {subnet}")
+                    update_canvas_region()
+                run_job(functools.partial(ipv6_steps_verbose, subnet, simple_mode=simple), draw)
+        elif mode_var.get() == "vlsm":
+            raw_text = entry_vlsm.get()
+            raw = raw_text.replace(",", " ").split()
+            base = entry_base.get().strip()
+            if not raw or not base:
+                messagebox.showerror("Input required", "Please enter host counts (e.g. 50,20,10) and a base network.")
+                return
+            def draw(result):
+                out, plan = result
+                explanation.set_text(out)
+                canvas.create_text(18,12, anchor="nw", text=f"VLSM Plan inside {plan['base']}", fill="#ecf0f1", font=("Segoe UI",12,"bold"))
+                width = plan["width"]
+                base_net, base_prefix = plan["base"].split("/")
+                base_int = int(ipaddress.ip_address(base_net))
+                host_maps.append(HostMap(canvas, 18, 40, base_int, 1 << (width - int(base_prefix)),
+                                         vlsm_host_spans(plan), addr_width=width))
+                max_rows = 40
+                sy = 40 + HOST_MAP_H + 44
+                for a in plan["allocations"][:max_rows]:
+                    canvas.create_text(18, sy, anchor="nw", text=f"#{a['index']+1}: {a['hosts']} hosts → {format_addr(a['network_int'], width)}/{a['prefix']}",
+                                       fill="#2ecc71", font=("Consolas",10))
+                    sy += 16
+                if len(plan["allocations"]) > max_rows:
+                    canvas.create_text(18, sy, anchor="nw", text=f"(+{len(plan['allocations']) - max_rows} more — see explanation)", fill="#eee", font=("Segoe UI",9))
+                    sy += 16
+                if plan["unplaced"]:
+                    canvas.create_text(18, sy, anchor="nw", text=f"Did not fit: {len(plan['unplaced'])} request(s)", fill="#e74c3c", font=("Segoe UI",10))
+                    sy += 16
+                canvas.create_text(18, sy+8, anchor="nw", text=f"Free: {plan['free_addresses']} addresses in {len(plan['free'])} blocks", fill="#f39c12", font=("Segoe UI",10))
+                visual["last"] = ("vlsm", plan, None)
+                update_canvas_region()
+            # long request lists are bulk work: plan them in a worker process
+            run_job(functools.partial(vlsm_steps, base, raw, simple_mode=simple), draw,
+                    heavy=len(raw_text) > HEAVY_INPUT_CHARS)
+        elif mode_var.get() == "lookup":
+            networks = entry_nets.get().strip()
+            addresses = entry_addrs.get().strip()
+            if not networks or not addresses:
+                messagebox.showerror("Input required", "Please enter networks (or choose a file) and the addresses to look up.")
+                return
+            def draw(result):
+                out, summary = result
+                explanation.set_text(out)
+                canvas.create_text(18,12, anchor="nw", text=f"Longest-prefix match over {summary['networks']} networks",
+                                   fill="#ecf0f1", font=("Segoe UI",12,"bold"))
+                canvas.create_text(18,40, anchor="nw", text=f"Matched {summary['matched']} of {summary['total']} addresses",
+                                   fill="#2ecc71" if summary['matched'] else "#e74c3c", font=("Segoe UI",10))
+                if summary["first"]:
+                    # the first match's nesting: outermost network on top, the winner (longest prefix) at the bottom
+                    address, chain = summary["first"]
+                    canvas.create_text(18, 72, anchor="nw", text=f"Networks containing {address}:", fill="#ecf0f1",
+                                       font=("Segoe UI",10,"bold"))
+                    y = 96
+                    for depth, (net, label) in enumerate(reversed(chain)):
+                        x = 18 + depth * 24
+                        winner = depth == len(chain) - 1
+                        canvas.create_rectangle(x, y, x + 420 - depth * 24, y + 26, fill="#27ae60" if winner else "#34495e", outline="#111")
+                        canvas.create_text(x + 8, y + 13, anchor="w", text=f"{net}  {label}".rstrip() + ("   ← longest match" if winner else ""),
+                                           fill="white", font=("Consolas",10))
+                        y += 32
+                update_canvas_region()
+            # a network file can hold hundreds of thousands of prefixes: index and search it on the "lpm" worker,
+            # whose cache keeps the index for the next lookup against the same file
+            run_job(functools.partial(lpm_lookup_steps, networks, addresses), draw,
+                    heavy="lpm" if os.path.isfile(networks) else len(addresses) > HEAVY_INPUT_CHARS)
+        elif mode_var.get() == "aggregate":
+            source = entry_nets.get().strip()
+            if not source:
+                messagebox.showerror("Input required", "Please enter prefixes (e.g. 10.0.0.0/24, 10.0.1.0/24) or choose a file.")
+                return
+            def draw(result):
+                out, res = result
+                explanation.set_text(out)
+                total = sum(len(v) for v in res["output"].values())
+                canvas.create_text(18,12, anchor="nw", text=f"Summarized {res['input']} prefixes → {total} CIDRs",
+                                   fill="#ecf0f1", font=("Segoe UI",12,"bold"))
+                y = 44
+                for version, width in ((4, 32), (6, 128)):
+                    blocks = res["output"][version]
+                    if not blocks:
+                        continue
+                    # the summary blocks laid out along their common supernet
+                    sup, sup_prefix = res["supernet"][version]
+                    span = 1 << (width - sup_prefix)
+                    canvas.create_text(18, y, anchor="nw", text=f"IPv{version} inside {format_addr(sup, width)}/{sup_prefix}",
+                                       fill="#ecf0f1", font=("Segoe UI",10,"bold"))
+                    bar_w = 560
+                    canvas.create_rectangle(18, y + 22, 18 + bar_w, y + 46, fill="#34495e", outline="#111")
+                    for net, prefix in blocks[:2000]:
+                        x0 = 18 + (net - sup) * bar_w // span
+                        x1 = 18 + (net - sup + (1 << (width - prefix))) * bar_w // span
+                        canvas.create_rectangle(x0, y + 22, max(x1, x0 + 1), y + 46, fill="#27ae60", outline="")
+                    y += 56
+                    for net, prefix in blocks[:20]:
+                        canvas.create_text(18, y, anchor="nw", text=f"{format_addr(net, width)}/{prefix}", fill="#2ecc71", font=("Consolas",10))
+                        y += 16
+                    if len(blocks) > 20:
+                        canvas.create_text(18, y, anchor="nw", text=f"(+{len(blocks) - 20} more — see explanation)", fill="#eee", font=("Segoe UI",9))
+                        y += 16
+                    y += 16
+                update_canvas_region()
+            # a full routing table is bulk work: parse and sweep it in a worker process
+            run_job(functools.partial(aggregate_source_steps, source, simple_mode=simple), draw,
+                    heavy=os.path.isfile(source) or len(source) > HEAVY_INPUT_CHARS)
+        else:
+            # Hosts -> Subnet
+            hosts = entry_hosts.get().strip()
+            if not hosts:
+                messagebox.showerror("Input required", "Please enter number of hosts.")
+                return
+            if version_var.get() == 4:
+                base = entry_base.get().strip()
+                def draw(result):
+                    out, res = result
+                    explanation.set_text(out)
+                    canvas.create_text(18,12, anchor="nw", text=f"Hosts -> Subnet (IPv4)", fill="#ecf0f1", font=("Segoe UI",12,"bold"))
+                    if res:
+                        canvas.create_text(18,40, anchor="nw", text=f"Result: /{res['prefix']}  Total: {res['total']}  Usable: {res['usable']}", fill="#2ecc71")
+                        if base:
+                            try:
+                                base_net = ipaddress.IPv4Network(base, strict=False)
+                                subnets = SubnetSequence(base_net, res['prefix'])
+                                first = subnets[0]
+                                canvas.create_text(18,64, anchor="nw", text=f"Example inside {base}: {first.network_address}/{first.prefixlen}")
+                                draw_subnet_page(canvas, 18, 96, subnets)
+                            except Exception as e:
+                                canvas.create_text(18,64, anchor="nw", text=f"Base parse error: {e}", fill="#e74c3c")
+                    update_canvas_region()
+                run_job(functools.partial(hosts_to_ipv4_steps, hosts, simple_mode=simple), draw)
+            else:
+                def draw(result):
+                    out, res = result
+                    explanation.set_text(out)
+                    if res:
+                        canvas.create_text(18,12, anchor="nw", text=f"Result: /{res['prefix']}  Total: {res['total']}", fill="#2ecc71")
+                    update_canvas_region()
+                run_job(functools.partial(hosts_to_ipv6_steps, hosts, simple_mode=simple), draw)
+
+    # bind operations
+    run_btn.config(command=lambda: show_steps(animated=True))
+    static_btn.config(command=lambda: show_steps(animated=False))
+
+    def replay():
+        # rewind the current animation's Timeline; recompute only when nothing has been animated yet
+        anim = animator["obj"]
+        if anim is None:
+            show_steps(animated=True)
+            return
+        pause_btn.config(text="Pause")
+        anim.run()
+
+    replay_btn.config(command=replay)
+
+    def toggle_pause():
+        anim = animator["obj"]
+        if anim is None:
+            return
+        if anim.timeline.paused:
+            anim.resume()
+            pause_btn.config(text="Pause")
+        else:
+            anim.pause()
+            pause_btn.config(text="Resume")
+
+    def step(delta):
+        anim = animator["obj"]
+        if anim is not None:
+            anim.step(delta)
+            pause_btn.config(text="Resume")
+            update_canvas_region()
+
+    def speed_changed(_event=None):
+        anim = animator["obj"]
+        if anim is not None:
+            anim.set_speed_ms({'slow':1200,'normal':700,'fast':300}[speed_combo.get()])
+
+    pause_btn.config(command=toggle_pause)
+    back_btn.config(command=lambda: step(-1))
+    fwd_btn.config(command=lambda: step(1))
+    speed_combo.bind("<<ComboboxSelected>>", speed_changed)
+
+    def export_pdf_action():
+        txt = explanation.get().strip()
+        if not txt:
+            messagebox.showinfo("Export", "Nothing to export. Generate steps first.")
+            return
+        filename = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF","*.pdf")])
+        if not filename:
+            return
+        import export  # reportlab/Pillow load on the first export, not at startup
+        try:
+            # the picture is rebuilt from the same data the canvas shows, as vector shapes (no canvas snapshot)
+            drawing = None
+            if visual["last"] is not None:
+                kind, data, title = visual["last"]
+                with METRICS.span("pdf.drawing"):
+                    drawing = export.tutor_drawing(kind, data, title=title)
+            export.export_to_pdf(filename, "Subnetting Steps", txt, drawing=drawing)
+            messagebox.showinfo("Export", f"PDF saved to {filename}")
+        except Exception as e:
+            messagebox.showerror("Export failed", str(e))
+
+    export_btn.config(command=export_pdf_action)
+
+# ---------- Diagnostics ----------
+# A toggleable panel in the main window showing METRICS (spans around compute, text, drawing,
+# animation and PDF building, job/animation counters, the canvas item count) and RESULT_CACHE.
+# "Profile next run" arms PROFILE; the tutor's next Show Steps is then run under cProfile.
+DIAG_REFRESH_MS = 500
+PROFILE_TOP = 20
+PROFILE = {"armed": False, "profile": None}
+
+def diagnostics_lines(snap):
+    lines = [f"{'span':<20}{'count':>7}{'mean ms':>10}{'max ms':>10}{'last ms':>10}{'total ms':>11}"]
+    for name, sp in snap["spans"].items():
+        lines.append(f"{name:<20}{sp['count']:>7}{sp['mean_ms']:>10.2f}{sp['max_ms']:>10.2f}{sp['last_ms']:>10.2f}{sp['total_ms']:>11.1f}")
+    if not snap["spans"]:
+        lines.append("(nothing timed yet — run a conversion or open the tutor)")
+    values = {**snap["counters"], **snap["gauges"]}
+    if values:
+        lines.append("")
+        lines.append("   ".join(f"{k}: {v}" for k, v in values.items()))
+    c = snap["cache"]
+    lookups = c["hits"] + c["misses"]
+    rate = f"{c['hits'] / lookups:.0%} hit rate" if lookups else "no lookups"
+    lines.append(f"cache: {c['hits']} hits / {c['misses']} misses ({rate}), {c['entries']} entries, "
+                 f"{c['bytes'] / 1024:.0f} KiB, {c['evictions']} evictions")
+    return lines
+
+def profile_report(profiler, top=PROFILE_TOP):
+    import pstats
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+    return out.getvalue().strip("\n").split("\n")
+
+class DiagnosticsPanel:
+    def __init__(self, master):
+        self.frame = ttk.Labelframe(master, text="Diagnostics", padding=6)
+        self.frame.grid_columnconfigure(0, weight=1)
+        # a plain Text, not a LineView: refreshing the panel must not show up in the view.set_lines span
+        self.text = tk.Text(self.frame, height=12, wrap="none", font=("Consolas",9), state="disabled")
+        self.text.grid(row=0, column=0, sticky="nsew")
+        scroll = ttk.Scrollbar(self.frame, orient="vertical", command=self.text.yview)
+        scroll.grid(row=0, column=1, sticky="ns")
+        self.text.configure(yscrollcommand=scroll.set)
+        buttons = ttk.Frame(self.frame)
+        buttons.grid(row=1, column=0, columnspan=2, sticky="w", pady=(6,0))
+        ttk.Button(buttons, text="Reset", command=self.reset).grid(row=0, column=0, padx=(0,6))
+        ttk.Button(buttons, text="Save JSON…", command=self.save_json).grid(row=0, column=1, padx=6)
+        self.profile_btn = ttk.Button(buttons, text="Profile next Show Steps", command=self.arm_profile)
+        self.profile_btn.grid(row=0, column=2, padx=6)
+        ttk.Button(buttons, text="Save profile…", command=self.save_profile).grid(row=0, column=3, padx=6)
+        self._after = None
+        self._profile = None
+        self._profile_lines = []
+
+    def grid(self, **kw):
+        self.frame.grid(**kw)
+        self.refresh()
+
+    def grid_remove(self):
+        if self._after is not None:
+            self.frame.after_cancel(self._after)
+            self._after = None
+        self.frame.grid_remove()
+
+    def refresh(self):
+        self._after = None
+        if PROFILE["profile"] is not self._profile:
+            self._profile = PROFILE["profile"]
+            self._profile_lines = [] if self._profile is None else (
+                ["", "cProfile of the last profiled Show Steps (compute + draw):"] + profile_report(self._profile))
+        if not PROFILE["armed"]:
+            self.profile_btn.config(text="Profile next Show Steps")
+        lines = diagnostics_lines(METRICS.snapshot()) + self._profile_lines
+        t = self.text
+        top = t.yview()[0]
+        t.config(state="normal")
+        t.delete("1.0", tk.END)
+        t.insert("1.0", "\n".join(lines))
+        t.config(state="disabled")
+        t.yview_moveto(top)
+        self._after = self.frame.after(DIAG_REFRESH_MS, self.refresh)
+
+    def reset(self):
+        METRICS.reset()
+        PROFILE["profile"] = None
+        self.refresh_now()
+
+    def refresh_now(self):
+        if self._after is not None:
+            self.frame.after_cancel(self._after)
+        self.refresh()
+
+    def arm_profile(self):
+        PROFILE["armed"] = True
+        self.profile_btn.config(text="Armed — run Show Steps")
+
+    def save_json(self):
+        filename = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON","*.json")])
+        if not filename:
+            return
+        snap = METRICS.snapshot()
+        if PROFILE["profile"] is not None:
+            snap["profile"] = profile_report(PROFILE["profile"])
+        with open(filename, "w") as f:
+            json.dump(snap, f, indent=2)
+
+    def save_profile(self):
+        if PROFILE["profile"] is None:
+            messagebox.showinfo("Profile", "Nothing profiled yet. Click \"Profile next Show Steps\", then run the tutor.")
+            return
+        filename = filedialog.asksaveasfilename(defaultextension=".prof", filetypes=[("cProfile stats","*.prof")])
+        if filename:
+            # readable with pstats, snakeviz or any other cProfile viewer
+            PROFILE["profile"].dump_stats(filename)
+
+# ---------- Main window (grid layout with anchored bottom controls) ----------
+def main_app():
+    style = tb.Style(theme="superhero")
+    root = style.master
+    root.title("Number Systems & Network Tutor (Final UX)")
+    root.minsize(1000,700)
+    root.geometry("1100x760")
+    try:
+        root.eval('tk::PlaceWindow %s center' % root.winfo_toplevel())
+    except Exception:
+        pass
+
+    # configure root grid: row0 content (expand), row1 diagnostics (hidden until toggled), row2 bottom controls (fixed)
+    root.grid_rowconfigure(0, weight=1)
+    root.grid_rowconfigure(1, weight=0)
+    root.grid_rowconfigure(2, weight=0)
+    root.grid_columnconfigure(0, weight=1)
+
+    # notebook area (row 0)
+    notebook = ttk.Notebook(root)
+    notebook.grid(row=0, column=0, sticky="nsew", padx=12, pady=8)
+
+    diagnostics = DiagnosticsPanel(root)
+
+    # bottom control bar (row 2) anchored
+    bottom = ttk.Frame(root, padding=8)
+    bottom.grid(row=2, column=0, sticky="ew")
+    bottom.grid_columnconfigure(0, weight=1)
+    left_btns = ttk.Frame(bottom)
+    left_btns.grid(row=0, column=0, sticky="w")
+    right_btns = ttk.Frame(bottom)
+    right_btns.grid(row=0, column=1, sticky="e")
+
+    # simple english toggle variable
+    simple_mode_var = tk.IntVar(value=0)
+    try:
+        switch = ctk.CTkSwitch(master=left_btns, text="Simple English Mode", command=lambda: simple_mode_var.set(0 if simple_mode_var.get() else 1))
+        switch.grid(row=0, column=0, padx=6)
+    except Exception:
+        ttk.Checkbutton(left_btns, text="Simple English Mode", variable=simple_mode_var).grid(row=0, column=0, padx=6)
+
+    ttk.Button(right_btns, text="Open Subnet Tutor", bootstyle="info", command=lambda: open_tutor_window(root, simple_mode_var)).grid(row=0, column=0, padx=6)
+    ttk.Button(right_btns, text="Apply Theme", command=lambda: tb.Style(theme="superhero")).grid(row=0, column=1, padx=6)
+    diag_var = tk.BooleanVar(value=False)
+
+    def toggle_diagnostics(*_):
+        if diag_var.get():
+            diagnostics.grid(row=1, column=0, sticky="ew", padx=12)
+        else:
+            diagnostics.grid_remove()
+    diag_var.trace_add("write", toggle_diagnostics)
+    ttk.Checkbutton(right_btns, text="Diagnostics (F12)", variable=diag_var).grid(row=0, column=2, padx=6)
+    root.bind("<F12>", lambda e: diag_var.set(not diag_var.get()))
+
+    runner = JobRunner.for_widget(root)
+
+    # helper to create converter tabs with grid inside
+    def make_tab(title, placeholder, convert_fn, fields=(), live_base=None):
+        frame = ttk.Frame(notebook)
+        notebook.add(frame, text=title)
+        # grid top (controls) and center (output)
+        frame.grid_rowconfigure(1, weight=1)
+        frame.grid_columnconfigure(0, weight=1)
+        top = ttk.Frame(frame, padding=(8,8))
+        top.grid(row=0, column=0, sticky="ew")
+        top.grid_columnconfigure(1, weight=1)
+        ttk.Label(top, text=placeholder).grid(row=0, column=0, sticky="w")
+        entry_var = tk.StringVar()
+        entry = ttk.Entry(top, textvariable=entry_var)
+        entry.grid(row=0, column=1, sticky="ew", padx=6)
+        convert_btn = ttk.Button(top, text="Convert")
+        convert_btn.grid(row=0, column=2, padx=6)
+        copy_btn = ttk.Button(top, text="Copy Result")
+        copy_btn.grid(row=0, column=3, padx=6)
+        stop_btn = ttk.Button(top, text="Stop", state="disabled")
+        stop_btn.grid(row=0, column=4, padx=6)
+        live_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top, text="Live", variable=live_var).grid(row=0, column=5, padx=6)
+        # optional extra inputs (label, default) on a second row, passed to convert_fn after the value
+        field_entries = []
+        if fields:
+            field_row = ttk.Frame(top)
+            field_row.grid(row=1, column=0, columnspan=6, sticky="w", pady=(6,0))
+            for i, (label, default) in enumerate(fields):
+                ttk.Label(field_row, text=label).grid(row=0, column=2*i, sticky="w", padx=(0 if i == 0 else 12, 4))
+                fe = ttk.Entry(field_row, width=6)
+                fe.insert(0, default)
+                fe.grid(row=0, column=2*i+1, sticky="w")
+                field_entries.append(fe)
+        output_frame = ttk.Frame(frame)
+        output_frame.grid(row=1, column=0, sticky="nsew", padx=8, pady=8)
+        output_frame.grid_rowconfigure(0, weight=1)
+        output_frame.grid_columnconfigure(0, weight=1)
+        txt = LineView(output_frame, font=("Consolas",11))
+        txt.grid(row=0, column=0, columnspan=2, sticky="nsew")
+        status_frame = ttk.Frame(output_frame)
+        status_frame.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(4,0))
+        progress = ttk.Progressbar(status_frame, mode="indeterminate", length=120)
+        progress.grid(row=0, column=0, padx=(0,8))
+        status = ttk.Label(status_frame, text="")
+        status.grid(row=0, column=1, sticky="w")
+
+        # the converter streams its lines from the shared JobRunner (a process for long inputs), so the
+        # first lines show up right away; a new Convert or Stop supersedes the tab's previous job.
+        # Finished outputs are kept in RESULT_CACHE.
+        channel = ("tab", title)
+        started = {"t": 0.0}
+
+        def finish(msg):
+            progress.stop()
+            stop_btn.config(state="disabled")
+            status.config(text=msg)
+
+        def stop_job():
+            if runner.busy(channel):
+                runner.cancel(channel)
+                finish(f"Stopped — {len(txt.lines)} lines")
+
+        def more(batch):
+            txt.append(batch)
+            status.config(text=f"Working… {len(txt.lines)} lines")
+
+        def failed(e):
+            txt.append([f"Error: {e}"])
+            finish("")
+
+        def do_convert():
+            v = entry.get().strip()
+            args = [fe.get().strip() for fe in field_entries]
+            runner.cancel(channel)
+            txt.clear()
+            key = ("tab", title, v, *args)
+            cached = RESULT_CACHE.get(key)
+            if cached is not None:
+                txt.set_lines(cached)
+                finish(f"Done — {len(cached)} lines (cached)")
+                return
+
+            def done(count):
+                METRICS.record("tab.job", time.perf_counter() - started["t"])
+                RESULT_CACHE.put(key, tuple(txt.lines))
+                finish(f"Done — {count} lines ({(time.perf_counter() - started['t']) * 1000:.0f} ms)")
+            started["t"] = time.perf_counter()
+            # decimal inputs stay strings so the converter can parse long values subquadratically
+            runner.stream(channel, convert_fn, v, *args, on_lines=more, on_done=done, on_error=failed,
+                          heavy=len(v) > HEAVY_INPUT_CHARS)
+            progress.start(15)
+            stop_btn.config(state="normal")
+            status.config(text="Working…")
+
+        # live mode: recompute LIVE_DEBOUNCE_MS after the last edit. Single-input tabs keep a HornerValue,
+        # so a keystroke only re-reads the edited tail of the digits; the rest falls back to do_convert
+        horner = HornerValue(live_base, as_decimal=live_base != 10) if live_base else None
+        live = {"job": None}
+
+        def schedule_live(*_):
+            if live["job"] is not None:
+                root.after_cancel(live["job"])
+                live["job"] = None
+            if live_var.get():
+                live["job"] = root.after(LIVE_DEBOUNCE_MS, run_live)
+
+        def run_live():
+            live["job"] = None
+            s = entry.get().strip().upper()
+            if not s:
+                runner.cancel(channel)
+                txt.clear()
+                finish("")
+                return
+            if horner is None or not set(s) <= set(DIGITS36[:live_base]):
+                do_convert()
+                return
+            runner.cancel(channel)
+            started["t"] = time.perf_counter()
+            try:
+                value = horner.update(s)
+                lines = tuple(convert_fn(value) if live_base == 10 else convert_fn(s, decimal_text=horner.decimal_text()))
+            except Exception as e:
+                failed(e)
+                return
+            txt.set_lines(lines)
+            finish(f"Live — {len(lines)} lines ({(time.perf_counter() - started['t']) * 1000:.0f} ms)")
+
+        entry_var.trace_add("write", schedule_live)
+        live_var.trace_add("write", schedule_live)
+        for fe in field_entries:
+            fe.bind("<KeyRelease>", schedule_live, add="+")
+
+        def do_copy():
+            s = txt.get().strip()
+            if s:
+                root.clipboard_clear()
+                root.clipboard_append(s)
+                messagebox.showinfo("Copied", "Result copied to clipboard.")
+
+        convert_btn.config(command=do_convert)
+        copy_btn.config(command=do_copy)
+        stop_btn.config(command=stop_job)
+
+    make_tab("Decimal → Binary", "Enter decimal:", decimal_to_binary_lines, live_base=10)
+    make_tab("Decimal → Octal", "Enter decimal:", decimal_to_octal_lines, live_base=10)
+    make_tab("Decimal → Hexadecimal", "Enter decimal:", decimal_to_hex_lines, live_base=10)
+    make_tab("Binary → Decimal", "Enter binary:", binary_to_decimal_lines, live_base=2)
+    make_tab("Octal → Decimal", "Enter octal:", octal_to_decimal_lines, live_base=8)
+    make_tab("Hexadecimal → Decimal", "Enter hex:", hex_to_decimal_lines, live_base=16)
+    make_tab("Any Base → Any Base", "Enter number:", base_to_base_tab_lines,
+             fields=[("From base (2-36):", "16"), ("To base (2-36):", "8"), ("Two's complement bits (optional):", "")])
+
+    root.mainloop()
+    # TUTOR_METRICS=run.json python main.py: keep the session's diagnostics without clicking Save JSON
+    if os.environ.get("TUTOR_METRICS"):
+        METRICS.dump(os.environ["TUTOR_METRICS"])
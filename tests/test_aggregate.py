@@ -0,0 +1,92 @@
+import ipaddress
+import random
+
+import pytest
+
+import core
+from core import aggregate_main, aggregate_prefixes, aggregate_steps, parse_prefixes
+
+
+def _random_prefixes(rnd, n):
+    # clustered IPv4 prefixes (lots of overlap and adjacency), a few strays, and some IPv6
+    base = rnd.getrandbits(32) & 0xFFFF0000
+    out = []
+    for _ in range(n):
+        p = rnd.randint(18, 32)
+        net = base + (rnd.getrandbits(16) & (0xFFFF << (32 - p)) & 0xFFFF)
+        # host bits set on purpose now and then: they must be cleared
+        out.append(f"{ipaddress.IPv4Address(net | (rnd.getrandbits(32 - p) if rnd.random() < 0.1 else 0))}/{p}")
+    for _ in range(rnd.randint(0, 5)):
+        p = rnd.randint(0, 32)
+        out.append(f"{ipaddress.IPv4Address(rnd.getrandbits(32) >> (32 - p) << (32 - p) if p else 0)}/{p}")
+    for _ in range(rnd.randint(0, 40)):
+        p = rnd.randint(33, 48)
+        net = ((0x20010DB8 << 96) | (rnd.getrandbits(16) << 80)) >> (128 - p) << (128 - p)
+        out.append(f"{ipaddress.IPv6Address(net)}/{p}")
+    return out
+
+
+def _expected(cidrs, version):
+    nets = [ipaddress.ip_network(c, strict=False) for c in cidrs]
+    nets = [n for n in nets if n.version == version]
+    return [(int(n.network_address), n.prefixlen) for n in ipaddress.collapse_addresses(nets)]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_matches_collapse_addresses(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(core, "NUMPY_AVAILABLE", False)
+    rnd = random.Random(25)
+    for _ in range(60):
+        # sizes on both sides of the 1024-prefix threshold for the vectorized sweep
+        cidrs = _random_prefixes(rnd, rnd.choice([1, 10, 500, 3000]))
+        got = aggregate_prefixes(cidrs)
+        assert got[4] == _expected(cidrs, 4)
+        assert got[6] == _expected(cidrs, 6)
+
+
+def test_vectorized_matches_python_sweep():
+    pytest.importorskip("numpy")
+    rnd = random.Random(7)
+    for n in (1, 2, 50, 700):
+        nets, prefixes = parse_prefixes(_random_prefixes(rnd, n))[4]
+        assert core.aggregate_ipv4_vectorized(nets, prefixes) == [
+            c for s, e in core.merge_ranges(core.prefix_ranges(nets, prefixes)) for c in core.range_to_cidrs(s, e)]
+
+
+def test_invalid_entries():
+    errors = []
+    got = aggregate_prefixes(["10.0.0.0/25", "bogus", "10.0.0.128/25", "10.0.0.0/33"], errors)
+    assert got == {4: [(0x0A000000, 24)], 6: []}
+    assert [text for text, _ in errors] == ["bogus", "10.0.0.0/33"]
+    with pytest.raises(ValueError):
+        aggregate_prefixes(["bogus"])
+
+
+def test_trace():
+    text, result = aggregate_steps(["10.0.0.0/24", "10.0.1.0/24", "10.0.1.128/25", "bad"])
+    assert "inside the block, dropped" in text
+    assert "10.0.0.0/23" in text
+    assert result["output"][4] == [(0x0A000000, 23)]
+    assert [t for t, _ in result["errors"]] == ["bad"]
+
+
+@pytest.mark.parametrize("lines", ["", "bad\nx/3\n"])
+def test_cli_trace_without_valid_prefixes(tmp_path, capsys, lines):
+    path = tmp_path / "in.txt"
+    path.write_text(lines)
+    with pytest.raises(SystemExit) as exc:
+        aggregate_main([str(path), "--trace"])
+    assert exc.value.code == 2
+    assert "No valid prefixes" in capsys.readouterr().err
+
+
+def test_cli_trace_reports_skipped_lines(tmp_path, capsys):
+    path = tmp_path / "in.txt"
+    path.write_text("10.0.0.0/25\nbad\n10.0.0.128/25\n")
+    aggregate_main([str(path), "--trace"])
+    captured = capsys.readouterr()
+    assert "10.0.0.0/24" in captured.out
+    assert "skipped 'bad'" in captured.err
@@ -0,0 +1,49 @@
+import ipaddress
+import random
+
+import pytest
+
+import core
+from core import IPv4Subnet, ipv4_batch_row
+
+np = pytest.importorskip("numpy")
+
+EDGE_CASES = ["0.0.0.0/0", "255.255.255.255/32", "10.0.0.7/31", "192.168.1.77/24", "10.0.0.1",
+              " 10.1.2.3/24", "10.0.0.0/255.255.255.0", "bad", "10.0.0.0/33", "01.2.3.4/8", "1.2.3/8", ""]
+
+
+def _random_cidrs(n, seed=2):
+    rnd = random.Random(seed)
+    return [f"{ipaddress.IPv4Address(rnd.getrandbits(32))}/{rnd.randint(0, 32)}" for _ in range(n)] + EDGE_CASES
+
+
+def test_vectorized_fields_match_scalar_records():
+    cidrs = [c for c in _random_cidrs(2000) if ipv4_batch_row(c)[-1] == ""]
+    addrs, prefixes = core.cidrs_to_arrays(cidrs)
+    v = core.ipv4_subnets_vectorized(addrs, prefixes)
+    for i, c in enumerate(cidrs):
+        rec = IPv4Subnet(*core.parse_ipv4_cidr(c))
+        for field, key in core._VECTOR_FIELDS.items():
+            assert int(v[key][i]) == getattr(rec, field), (c, field)
+
+
+def test_batch_rows_match_scalar_rows():
+    cidrs = _random_cidrs(5000)
+    assert [list(r) for r in core.ipv4_batch_rows_vectorized(cidrs)] == [ipv4_batch_row(c) for c in cidrs]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_batch_chunk_same_output_with_and_without_numpy(monkeypatch, fmt):
+    cidrs = _random_cidrs(3000)
+    vectorized = core._batch_chunk((cidrs, fmt))
+    monkeypatch.setattr(core, "NUMPY_AVAILABLE", False)
+    assert vectorized == core._batch_chunk((cidrs, fmt))
+
+
+def test_cidrs_to_arrays_raises_or_collects_errors():
+    with pytest.raises(ValueError):
+        core.cidrs_to_arrays(["10.0.0.0/8", "bad"])
+    errors = {}
+    addrs, prefixes = core.cidrs_to_arrays(["10.0.0.0/8", "bad"], errors)
+    assert list(errors) == [1]
+    assert addrs.dtype == np.uint32 and addrs.tolist()[0] == 0x0A000000 and prefixes.tolist() == [8, 32]
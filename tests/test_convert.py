@@ -0,0 +1,57 @@
+import random
+import sys
+
+import pytest
+
+from core import (STEP_LIMIT, base_to_base_steps, decimal_to_binary_steps, digits_to_int, int_to_base_str,
+                  int_to_decimal_str)
+
+
+def test_fraction_longer_than_int_str_limit():
+    # more than sys.get_int_max_str_digits() (4300) digits in the fraction's numerator
+    text = base_to_base_steps("0." + "1" * 5000, 10, 2)
+    assert "digits)" in text
+    assert "✅ Base-2 Result: 0.000111" in text
+
+
+@pytest.fixture
+def no_int_str_limit():
+    # the reference conversions below go through int()/str(), which Python caps at 4300 digits
+    old = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    yield
+    sys.set_int_max_str_digits(old)
+
+
+def _big_values(rnd, bits):
+    n = rnd.getrandbits(bits) | (1 << (bits - 1))
+    # runs of zero digits inside the number exercise the low half's zero padding
+    return [n, 1 << bits, (1 << bits) - 1, 10 ** (bits // 4) + 1, 7 ** (bits // 3)]
+
+
+@pytest.mark.parametrize("base", [2, 3, 7, 8, 10, 16, 32, 36])
+def test_big_int_round_trip(no_int_str_limit, base):
+    rnd = random.Random(base)
+    for bits in (10_000, 40_000):
+        for n in _big_values(rnd, bits):
+            s = int_to_base_str(n, base)
+            assert s[0] != "0"
+            assert int(s, base) == n
+            assert digits_to_int(s, base) == n
+            assert int_to_base_str(-n, base) == "-" + s
+    assert int_to_base_str(0, base) == "0"
+
+
+def test_decimal_strings_match_str(no_int_str_limit):
+    rnd = random.Random(10)
+    for bits in (10_000, 100_000):
+        n = rnd.getrandbits(bits)
+        assert int_to_decimal_str(n) == str(n)
+        assert digits_to_int(str(n), 10) == n
+
+
+def test_capped_trace_keeps_exact_result(no_int_str_limit):
+    n = 10 ** 6000 + 12345
+    text = decimal_to_binary_steps(str(n))
+    assert text.endswith(format(n, "b"))
+    assert len(text.splitlines()) <= STEP_LIMIT + 5
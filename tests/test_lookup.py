@@ -0,0 +1,91 @@
+import ipaddress
+import random
+
+import pytest
+
+import core
+from core import PrefixIndex, lookup_rows, lpm_steps
+
+
+def _nested_table(rnd, n):
+    # networks nested inside each other (and some duplicates) under a few IPv4 and IPv6 roots
+    roots = [ipaddress.ip_network("10.0.0.0/8"), ipaddress.ip_network("192.168.0.0/16"),
+             ipaddress.ip_network("2001:db8::/32")]
+    nets = list(roots)
+    for _ in range(n):
+        parent = rnd.choice(nets)
+        extra = rnd.randint(1, 8 if parent.version == 4 else 24)
+        if parent.prefixlen + extra > parent.max_prefixlen:
+            continue
+        offset = rnd.getrandbits(parent.max_prefixlen - parent.prefixlen)
+        addr = (int(parent.network_address) | offset) >> (parent.max_prefixlen - parent.prefixlen - extra)
+        net = ipaddress.ip_network((addr << (parent.max_prefixlen - parent.prefixlen - extra), parent.prefixlen + extra))
+        nets.append(net)
+    rnd.shuffle(nets)
+    return nets
+
+
+def _probe_addresses(rnd, nets, n):
+    out = []
+    for _ in range(n):
+        net = rnd.choice(nets)
+        host = rnd.getrandbits(net.max_prefixlen - net.prefixlen) if net.prefixlen < net.max_prefixlen else 0
+        out.append(str(net.network_address + host))
+    # outside every root
+    out += ["8.8.8.8", "172.16.0.1", "2001:db9::1", "::"]
+    return out
+
+
+def _linear_scan(nets, address):
+    addr = ipaddress.ip_address(address)
+    best = None
+    for net in nets:
+        if addr in net and (best is None or net.prefixlen > best.prefixlen):
+            best = net
+    return best
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_lookup_matches_linear_scan(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(core, "NUMPY_AVAILABLE", False)
+    rnd = random.Random(24)
+    for _ in range(30):
+        nets = _nested_table(rnd, rnd.randint(1, 150))
+        index = PrefixIndex([(str(n), f"n{i}") for i, n in enumerate(nets)])
+        # enough addresses that lookup_rows takes the bulk (searchsorted) path for IPv4
+        addresses = _probe_addresses(rnd, nets, 300)
+        rows = lookup_rows(index, addresses)
+        for address, row in zip(addresses, rows):
+            want = _linear_scan(nets, address)
+            hit = index.lookup(address)
+            if want is None:
+                assert hit is None
+                assert row == [address, "", "", ""]
+            else:
+                assert index.network(hit) == str(want)
+                assert row[:2] == [address, str(want)]
+                assert row[2] == index.labels[hit]
+
+
+def test_covering_chain_is_longest_first():
+    index = PrefixIndex(["10.0.0.0/8", "10.1.0.0/16", "10.1.2.0/24", "10.2.0.0/16"])
+    chain = index.covering(index.lookup("10.1.2.3"))
+    assert [index.network(i) for i in chain] == ["10.1.2.0/24", "10.1.0.0/16", "10.0.0.0/8"]
+
+
+def test_invalid_addresses():
+    index = PrefixIndex(["10.0.0.0/8"])
+    rows = lookup_rows(index, ["10.0.0.1", "bogus", "300.1.1.1"])
+    assert rows[0] == ["10.0.0.1", "10.0.0.0/8", "", ""]
+    assert rows[1][3] and rows[2][3]
+
+
+def test_steps_cap_counts_invalid_lines():
+    index = PrefixIndex(["10.0.0.0/8"])
+    text, summary = lpm_steps(index, ["bad"] * 1000 + ["10.0.0.1"], max_lines=5)
+    assert len(text.splitlines()) < 15
+    assert summary["matched"] == 1
+    assert "(1000 invalid)" in text
@@ -0,0 +1,205 @@
+import ipaddress
+import random
+
+import pytest
+
+from core import (BuddyAllocator, IPv4Subnet, IPv4SubnetTable, SubnetSequence, hosts_to_ipv4, hosts_to_ipv4_steps,
+                  ipv4_prefix_for_hosts, ipv4_prefixes_for_hosts, ipv4_prefixes_for_hosts_vectorized,
+                  ipv4_steps_verbose, ipv6_prefix_for_hosts, vlsm_allocate, vlsm_steps)
+
+
+def _bin(a):
+    return ".".join(format(o, "08b") for o in ipaddress.IPv4Address(a).packed)
+
+
+def _viz_dict(cidr):
+    # the viz dict ipv4_steps_verbose used to return, built independently with ipaddress
+    ip = ipaddress.IPv4Address(cidr.split("/")[0])
+    net = ipaddress.IPv4Network(cidr, strict=False)
+    small = net.prefixlen >= 31
+    return {
+        "prefix": net.prefixlen,
+        "mask_dec": str(net.netmask),
+        "mask_bins": _bin(net.netmask).split("."),
+        "ip_dec": str(ip),
+        "ip_bins": _bin(ip).split("."),
+        "network": str(net.network_address),
+        "network_int": int(net.network_address),
+        "broadcast_int": int(net.broadcast_address),
+        "network_bin": _bin(net.network_address),
+        "broadcast": str(net.broadcast_address),
+        "broadcast_bin": _bin(net.broadcast_address),
+        "total": net.num_addresses,
+        "usable": net.num_addresses if small else net.num_addresses - 2,
+        "first": str(net.network_address if small else net.network_address + 1),
+        "last": str(net.broadcast_address if small else net.broadcast_address - 1),
+        "host_bits": 32 - net.prefixlen,
+        "mask_int": int(net.netmask),
+        "host_mask_int": int(net.hostmask),
+    }
+
+
+@pytest.mark.parametrize("cidr", ["172.54.1.0/26", "10.1.2.3/30", "192.168.7.9/31", "8.8.8.8/32", "0.0.0.0/0"])
+def test_record_matches_viz_dict(cidr):
+    _, rec = ipv4_steps_verbose(cidr)
+    old = _viz_dict(cidr)
+    assert dict(rec) == old
+    assert rec == old
+    assert len(rec) == len(old)
+    assert list(rec) == list(old)
+    assert dict(rec.items()) == old
+
+
+def test_table_rows_are_records():
+    table = IPv4SubnetTable.from_cidrs(["10.0.0.0/24", "bad", "10.0.1.7/31"], skip_invalid=True)
+    assert [dict(r) for r in table] == [_viz_dict("10.0.0.0/24"), _viz_dict("10.0.1.7/31")]
+    assert table[1] == IPv4Subnet(int(ipaddress.IPv4Address("10.0.1.7")), 31)
+
+
+def test_subnet_sequence_index_of():
+    subnets = SubnetSequence("10.0.0.0/16", 24)
+    assert subnets.index_of("10.0.5.9") == 5
+    assert str(subnets.containing("10.0.5.9")) == "10.0.5.0/24"
+    page = subnets[10:20]
+    assert page.index_of("10.0.12.1") == 2
+    with pytest.raises(ValueError, match=r"10\.0\.5\.0/24 \(which contains 10\.0\.5\.9\) is not in .* of 10\.0\.0\.0/16"):
+        page.index_of("10.0.5.9")
+    with pytest.raises(ValueError, match="is not inside 10.0.0.0/16"):
+        subnets.index_of("10.1.0.1")
+
+
+# ---------- Hosts → prefix ----------
+def _usable(prefix):
+    return {32: 1, 31: 2}.get(prefix, (1 << (32 - prefix)) - 2)
+
+
+def _brute_prefix(hosts):
+    # the longest prefix whose usable count holds the hosts, by trying every prefix length
+    for prefix in range(32, -1, -1):
+        if _usable(prefix) >= hosts:
+            return prefix
+    return None
+
+
+HOST_COUNTS = sorted({0, 1, 2, 3, 4, 5, 6, 62, 63, 64, 65, 254, 255, 256,
+                      *(v for k in range(2, 34) for v in ((1 << k) - 1, 1 << k, (1 << k) + 1)),
+                      (1 << 32) - 3, (1 << 32) - 2, (1 << 32) - 1})
+
+
+def test_hosts_to_prefix_matches_brute_force():
+    for hosts in HOST_COUNTS:
+        want = _brute_prefix(hosts)
+        assert ipv4_prefix_for_hosts(hosts) == want, hosts
+        res = hosts_to_ipv4(hosts)
+        if want is None:
+            assert res is None
+        else:
+            assert res == {"prefix": want, "total": 1 << (32 - want), "usable": _usable(want)}
+    assert ipv4_prefixes_for_hosts(HOST_COUNTS) == [_brute_prefix(h) for h in HOST_COUNTS]
+
+
+def test_hosts_to_prefix_boundaries():
+    assert [ipv4_prefix_for_hosts(h) for h in (0, 1, 2, 3)] == [32, 32, 31, 29]
+    assert ipv4_prefix_for_hosts((1 << 32) - 2) == 0
+    assert ipv4_prefix_for_hosts((1 << 32) - 1) is None
+
+
+def test_hosts_to_prefix_vectorized_matches_scalar():
+    np = pytest.importorskip("numpy")
+    got = ipv4_prefixes_for_hosts_vectorized(np.array(HOST_COUNTS, dtype=np.int64)).tolist()
+    assert got == [-1 if (p := ipv4_prefix_for_hosts(h)) is None else p for h in HOST_COUNTS]
+
+
+def test_hosts_trace_ends_with_answer():
+    text, res = hosts_to_ipv4_steps(500)
+    assert res["prefix"] == 23
+    assert text.splitlines()[-1] == "Found: /23 (total 512, usable 510)"
+    text, res = hosts_to_ipv4_steps(1 << 32)
+    assert res is None and text.endswith("No suitable prefix found.")
+
+
+def test_ipv6_hosts_to_prefix_matches_brute_force():
+    for hosts in HOST_COUNTS + [(1 << 128) - 1, 1 << 128, (1 << 128) + 1]:
+        want = next((p for p in range(128, -1, -1) if (1 << (128 - p)) >= hosts), None)
+        assert ipv6_prefix_for_hosts(hosts) == want, hosts
+
+
+# ---------- VLSM planner ----------
+def _check_plan(plan):
+    base = ipaddress.ip_network(plan["base"])
+    start, end = int(base.network_address), int(base.broadcast_address) + 1
+    blocks = [(a["network_int"], a["prefix"]) for a in plan["allocations"]] + plan["free"]
+    # allocations and free blocks are aligned, disjoint, inside the base, and together tile it exactly
+    pos = start
+    for net, prefix in sorted(blocks):
+        size = 1 << (plan["width"] - prefix)
+        assert net % size == 0
+        assert net == pos
+        pos += size
+    assert pos == end
+    assert plan["free_addresses"] == sum(1 << (plan["width"] - p) for _, p in plan["free"])
+    # largest first, ties in input order
+    assert [(a["prefix"], a["index"]) for a in plan["allocations"]] == sorted(
+        (a["prefix"], a["index"]) for a in plan["allocations"])
+    for a in plan["allocations"]:
+        assert a["hosts"] == plan["hosts"][a["index"]]
+        solve = ipv4_prefix_for_hosts if plan["width"] == 32 else ipv6_prefix_for_hosts
+        assert a["prefix"] == solve(a["hosts"])
+
+
+@pytest.mark.parametrize("base", ["10.0.0.0/16", "192.168.1.0/24", "172.16.0.0/12", "2001:db8::/56"])
+def test_vlsm_random_plans(base):
+    rnd = random.Random(base)
+    width = ipaddress.ip_network(base).max_prefixlen
+    for _ in range(200):
+        hosts = [rnd.choice([0, 1, 2, 3, rnd.randint(1, 1 << rnd.randint(1, width - 40 if width == 128 else 14))])
+                 for _ in range(rnd.randint(1, 12))]
+        plan = vlsm_allocate(base, hosts)
+        _check_plan(plan)
+        assert sorted([a["index"] for a in plan["allocations"]] + plan["unplaced"]) == list(range(len(hosts)))
+
+
+def test_vlsm_fits_whenever_blocks_fit():
+    # buddy splitting with largest-first order never fragments: power-of-two blocks summing to the base all fit
+    rnd = random.Random(6)
+    for _ in range(200):
+        sizes, room = [], 256
+        while room:
+            size = 1 << rnd.randint(3, room.bit_length() - 1)
+            sizes.append(size)
+            room -= size
+        rnd.shuffle(sizes)
+        plan = vlsm_allocate("10.1.2.0/24", [s - 2 for s in sizes])
+        _check_plan(plan)
+        assert plan["unplaced"] == [] and plan["free"] == [] and plan["free_addresses"] == 0
+
+
+def test_vlsm_known_plan():
+    plan = vlsm_allocate("192.168.0.0/24", [20, 100, 50, 2])
+    got = [(a["index"], str(ipaddress.IPv4Address(a["network_int"])), a["prefix"]) for a in plan["allocations"]]
+    assert got == [(1, "192.168.0.0", 25), (2, "192.168.0.128", 26), (0, "192.168.0.192", 27),
+                   (3, "192.168.0.224", 31)]
+    assert plan["free"] == [(0xC0A800E2, 31), (0xC0A800E4, 30), (0xC0A800E8, 29), (0xC0A800F0, 28)]
+    assert plan["free_addresses"] == 30
+
+
+def test_vlsm_requests_that_do_not_fit():
+    # 200 hosts needs a /24 (too big for a /25), the second /26 fills the space, the last one has no room left
+    plan = vlsm_allocate("10.0.0.0/25", [60, 200, 60, 30, 1 << 40])
+    _check_plan(plan)
+    assert [a["index"] for a in plan["allocations"]] == [0, 2]
+    assert plan["unplaced"] == [1, 3, 4]
+    assert plan["free"] == [] and plan["free_addresses"] == 0
+    text, _ = vlsm_steps("10.0.0.0/25", [60, 200, 60, 30, 1 << 40])
+    assert "Did not fit (3): #2 (200 hosts), #4 (30 hosts), #5 (1099511627776 hosts)" in text
+    with pytest.raises(ValueError, match="Invalid base network"):
+        vlsm_allocate("10.0.0.0/33", [10])
+
+
+def test_buddy_allocator_exhaustion():
+    alloc = BuddyAllocator(0, 30)
+    assert [alloc.allocate(32) for _ in range(4)] == [0, 1, 2, 3]
+    assert alloc.allocate(32) is None and alloc.free_blocks() == []
+    alloc = BuddyAllocator(8, 29)
+    assert alloc.allocate(28) is None
+    assert alloc.allocate(30) == 8 and alloc.free_blocks() == [(12, 30)]